@@ -0,0 +1,158 @@
+import random
+import time
+
+import numpy as np
+
+from main_logic import game_logic
+from opening_book import OpeningBook, get_opening_book
+from patterns import PatternBoard, PatternWeights
+from point import Point
+from settings import *
+from tactics import TacticalReader
+from transposition import TranspositionTable, get_shared_table
+from zobrist import position_hash
+
+
+class ComputerPlayer:
+    """
+    Компьютерный соперник без привязки к pygame: выбирает ход по доске (numpy-массиву).
+    Вся случайность идёт через rng: с одинаково засеянным rng ходы воспроизводятся в точности.
+    """
+
+    def __init__(self, size: int, book: OpeningBook | None = None,
+                 transpositions: TranspositionTable | None = None, use_book: bool = True,
+                 rng: random.Random | None = None, weights: PatternWeights | None = None) -> None:
+        self._size = size
+        self._rng = rng if rng is not None else random.Random()
+        self._logic = game_logic(size)
+        self._patterns = PatternBoard(size, weights)
+        self._tactics = TacticalReader(size)
+        self._transpositions = transpositions if transpositions is not None else get_shared_table()
+        self._book = (book if book is not None else get_opening_book()) if use_book else None
+
+    def _valid_moves(self, board: np.ndarray) -> list[tuple[int, int]]:
+        return [(col, row) for col in range(self._size) for row in range(self._size)
+                if self._logic.is_valid_move(col, row, board)]
+
+    def random_move(self, board: np.ndarray) -> tuple[int, int] | None:
+        valid_moves = self._valid_moves(board)
+        return self._rng.choice(valid_moves) if valid_moves else None
+
+    def best_move(self, board: np.ndarray, color_code: int = 2,
+                  time_budget_s: float | None = None) -> tuple[int, int] | None:
+        """
+        Лучший ход для color_code. time_budget_s — время на обдумывание по часам партии;
+        None — без ограничения.
+        """
+        # Дебютная книга: мгновенный ответ в первых ходах
+        if self._book is not None:
+            book_move = self._book.lookup(board, color_code == 2)
+            if book_move is not None and self._logic.is_valid_move(*book_move, board):
+                return book_move
+
+        # Повторная или транспонированная позиция берётся из таблицы транспозиций
+        position_key = position_hash(board, black_to_move=color_code == 2)
+        cached = self._transpositions.get(position_key)
+        if cached is not None and cached.best_move is not None \
+                and self._logic.is_valid_move(*cached.best_move, board):
+            self._transpositions.store(position_key, cached.value, cached.best_move)
+            return cached.best_move
+
+        deadline_ns = None if time_budget_s is None else time.perf_counter_ns() + int(time_budget_s * 1e9)
+        scored = self.score_moves(board, color_code, deadline_ns)
+        if scored:
+            best_score, best_move = scored[0]
+            self._transpositions.store(position_key, best_score, best_move)
+            return best_move
+
+        # Если ни один из критериев не сработал, выбираем случайный допустимый ход
+        return self.random_move(board)
+
+    def score_moves(self, board: np.ndarray, color_code: int = 2,
+                    deadline_ns: int | None = None) -> list[tuple[float, tuple[int, int]]]:
+        """
+        Оценки кандидатов (по убыванию): приоритет захватов, затем либертей, затем формы.
+        После deadline_ns (perf_counter_ns) оставшиеся кандидаты не оцениваются: они идут
+        по убыванию априорной вероятности, так что отбрасываются наименее вероятные.
+        """
+        opponent_color = "white" if color_code == 2 else "black"
+
+        # Кандидаты в порядке убывания априорной вероятности по локальным шаблонам
+        self._patterns.sync(board)
+        candidates = self._patterns.ordered_moves(color_code, AI_CANDIDATE_LIMIT)
+        top_prior = candidates[0][1] if candidates else 1.0
+        # Дыхания групп в атари и с двумя дыханиями (захват, уход из атари) — всегда и в первую очередь,
+        # какой бы ни была их априорная вероятность
+        ranked = {move for move, _ in candidates}
+        urgent = [(move, 0.0) for move in self._urgent_points(board) if move not in ranked]
+        candidates = urgent + candidates
+
+        scored: list[tuple[float, tuple[int, int]]] = []
+        for (col, row), prior in candidates:
+            if deadline_ns is not None and scored and time.perf_counter_ns() >= deadline_ns:
+                break
+            # Симуляция хода: копирование доски и размещение камня
+            temp_board = board.copy()
+            temp_board[col, row] = color_code
+
+            # Симуляция захватов камней противника
+            captures = self._simulate_captures(temp_board, opponent_color)
+
+            # Подсчет либертей для группы камней после хода
+            group = self._logic.get_group(temp_board, Point(col, row))
+            liberties = self._logic.count_liberties(temp_board, group)
+
+            score = captures * 10 + liberties + AI_PRIOR_WEIGHT * prior / top_prior
+            score += self._tactical_score(temp_board, group, liberties, captures, color_code)
+            scored.append((score, (col, row)))
+
+        # Стабильная сортировка: при равной оценке раньше идёт ход с большей априорной вероятностью
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored
+
+    def _urgent_points(self, board: np.ndarray) -> list[tuple[int, int]]:
+        """Дыхания всех групп (обоих цветов) с одним или двумя дыханиями."""
+        seen: set[Point] = set()
+        points: set[tuple[int, int]] = set()
+        for col, row in zip(*np.nonzero(board)):
+            stone = Point(int(col), int(row))
+            if stone in seen:
+                continue
+            group = self._logic.get_group(board, stone)
+            seen |= group
+            liberties = self._logic.get_liberties(board, group)
+            if len(liberties) <= 2:
+                points.update((point.x, point.y) for point in liberties)
+        return sorted(points)
+
+    def _tactical_score(self, temp_board: np.ndarray, group: set[Point], liberties: int, captures: int,
+                        color_code: int) -> float:
+        """
+        Поправка за тактику на два хода вперёд: самоубийство, своя группа в лестнице или самоатари,
+        группы соперника, которые не уходят из атари. Читается только при малом числе дыханий.
+        """
+        if liberties == 0 and not captures:
+            # Самоубийство: камень снимется сразу, дальше читать нечего
+            return -TACTICS_SUICIDE_PENALTY
+        score = 0.0
+        stone = next(iter(group))
+        if liberties == 1 and not captures:
+            score -= TACTICS_LOSS_PENALTY * len(group)
+        elif liberties == 2 and self._tactics.ladder_works(temp_board, stone):
+            score -= TACTICS_LOSS_PENALTY * len(group)
+
+        for enemy_group in self._logic.get_adjacent_groups(temp_board, group, 3 - color_code):
+            if self._logic.count_liberties(temp_board, enemy_group) == 1 \
+                    and not self._tactics.can_escape(temp_board, next(iter(enemy_group))):
+                score += TACTICS_CAPTURE_BONUS * len(enemy_group)
+        return score
+
+    def _simulate_captures(self, temp_board: np.ndarray, opponent_color: str) -> int:
+        captures = 0
+        opponent_groups = self._logic.get_stone_groups(temp_board, opponent_color)
+        for group in opponent_groups:
+            if self._logic.stone_group_has_no_liberties(temp_board, group):
+                captures += len(group)
+                for point in group:
+                    temp_board[point.x, point.y] = 0  # Захват камней противника
+        return captures
@@ -0,0 +1,258 @@
+import argparse
+import collections
+import multiprocessing
+import queue
+import random
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from settings import *
+from zobrist import position_hash
+
+
+@dataclass
+class AnalysisResult:
+    key: int
+    playouts: int
+    black_win_rate: float
+    ownership: np.ndarray  # (size, size): +1 — территория чёрных, -1 — белых
+    candidates: list[tuple[tuple[int, int], float, int]]  # ход, доля побед ходящего, число партий
+
+
+@dataclass
+class _PositionStats:
+    cells: list[int]
+    to_play: int
+    playouts: int = 0
+    black_wins: int = 0
+    ownership: list[int] = field(default_factory=list)
+    first_moves: dict[int, list[int]] = field(default_factory=dict)  # клетка -> [партии, победы ходящего]
+
+
+def _neighbours(size: int) -> list[tuple[int, ...]]:
+    """Соседи клетки в плоском списке: индекс = col * size + row, как в board.ravel()."""
+    result = []
+    for col in range(size):
+        for row in range(size):
+            result.append(tuple(next_col * size + next_row
+                                for next_col, next_row in ((col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1))
+                                if 0 <= next_col < size and 0 <= next_row < size))
+    return result
+
+
+def _group(cells: list[int], neighbours: list[tuple[int, ...]], start: int) -> list[int] | None:
+    """Группа камней из start, если у неё нет дыханий; при первом найденном дыхании — None."""
+    color = cells[start]
+    group = [start]
+    seen = {start}
+    for point in group:
+        for neighbour in neighbours[point]:
+            value = cells[neighbour]
+            if value == 0:
+                return None
+            if value == color and neighbour not in seen:
+                seen.add(neighbour)
+                group.append(neighbour)
+    return group
+
+
+def _play(cells: list[int], neighbours: list[tuple[int, ...]], point: int, color: int) -> list[int] | None:
+    """Ставит камень со снятием пленных; None (и доска без изменений) для самоубийства."""
+    cells[point] = color
+    captured: list[int] = []
+    has_liberty = False
+    for neighbour in neighbours[point]:
+        value = cells[neighbour]
+        if value == 0:
+            has_liberty = True
+        elif value != color:
+            group = _group(cells, neighbours, neighbour)
+            if group is not None:
+                for stone in group:
+                    cells[stone] = 0
+                captured.extend(group)
+    if not captured and not has_liberty and _group(cells, neighbours, point) is not None:
+        cells[point] = 0
+        return None
+    return captured
+
+
+def playout(cells: list[int], neighbours: list[tuple[int, ...]], to_play: int, rng: random.Random,
+            komi: float = KOMI) -> tuple[float, list[int], int | None]:
+    """
+    Случайная партия до конца на плоском списке (без numpy: поэлементный доступ к спискам быстрее).
+    Свои глаза не заполняются, игра кончается двумя пасами. Возвращает перевес чёрных,
+    владельца каждой клетки (1 — чёрные, -1 — белые, 0 — ничья) и первый ход.
+    """
+    cells = list(cells)
+    empties = [point for point, value in enumerate(cells) if value == 0]
+    first_move: int | None = None
+    passes = 0
+    color = to_play
+    for _ in range(len(cells) * 3):
+        played = False
+        count = len(empties)
+        start = rng.randrange(count) if count else 0
+        for offset in range(count):
+            index = (start + offset) % count
+            point = empties[index]
+            # Не заполняем собственный глаз
+            if all(cells[neighbour] == color for neighbour in neighbours[point]):
+                continue
+            captured = _play(cells, neighbours, point, color)
+            if captured is None:
+                continue
+            empties[index] = empties[-1]
+            empties.pop()
+            empties.extend(captured)
+            if first_move is None and color == to_play:
+                first_move = point
+            played = True
+            break
+        if first_move is None and color == to_play:
+            first_move = -1  # первым ходом был пас
+        passes = 0 if played else passes + 1
+        if passes == 2:
+            break
+        color = 3 - color
+
+    owners = []
+    score = -komi
+    for point, value in enumerate(cells):
+        if value == 0:
+            around = {cells[neighbour] for neighbour in neighbours[point]}
+            value = around.pop() if len(around) == 1 else 0
+        owner = 1 if value == 2 else -1 if value == 1 else 0
+        owners.append(owner)
+        score += owner
+    return score, owners, first_move if first_move != -1 else None
+
+
+def _result(key: int, size: int, stats: _PositionStats) -> AnalysisResult:
+    playouts = max(stats.playouts, 1)
+    ownership = np.array(stats.ownership, dtype=np.float32).reshape(size, size) / playouts
+    candidates = [((point // size, point % size), wins / visits, visits)
+                  for point, (visits, wins) in stats.first_moves.items() if visits >= ANALYSIS_MIN_VISITS]
+    candidates.sort(key=lambda item: item[1], reverse=True)
+    return AnalysisResult(key, stats.playouts, stats.black_wins / playouts, ownership,
+                          candidates[:ANALYSIS_CANDIDATES])
+
+
+def _worker(size: int, requests: multiprocessing.Queue, results: multiprocessing.Queue, seed: int | None) -> None:
+    """
+    Процесс анализа: играет случайные партии из текущей позиции и каждые ANALYSIS_REPORT_INTERVAL
+    отправляет накопленный результат. Новая позиция прерывает работу сразу после текущей партии;
+    статистика уже разобранных позиций хранится и продолжается при возврате к ним.
+    """
+    rng = random.Random(seed)
+    neighbours = _neighbours(size)
+    cache: collections.OrderedDict[int, _PositionStats] = collections.OrderedDict()
+    key: int | None = None
+    stats: _PositionStats | None = None
+    while True:
+        idle = stats is None or stats.playouts >= ANALYSIS_MAX_PLAYOUTS
+        position = None
+        try:
+            message = requests.get(block=idle)
+            while True:
+                # Сообщения разбираются по порядку: "stop" не теряется за пришедшей следом позицией
+                if message == "stop":
+                    return
+                position = message  # из нескольких позиций важна только последняя
+                message = requests.get_nowait()
+        except queue.Empty:
+            pass
+        if position is not None:
+            key, cells, to_play = position
+            stats = cache.get(key)
+            if stats is None:
+                stats = cache[key] = _PositionStats(cells, to_play, ownership=[0] * len(cells))
+                if len(cache) > ANALYSIS_CACHE_POSITIONS:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(key)
+                results.put(_result(key, size, stats))  # прежний результат — сразу, без ожидания
+            continue
+
+        deadline = time.perf_counter() + ANALYSIS_REPORT_INTERVAL
+        while time.perf_counter() < deadline and stats.playouts < ANALYSIS_MAX_PLAYOUTS and requests.empty():
+            score, owners, first_move = playout(stats.cells, neighbours, stats.to_play, rng)
+            black_won = score > 0
+            stats.playouts += 1
+            stats.black_wins += black_won
+            ownership = stats.ownership
+            for point, owner in enumerate(owners):
+                ownership[point] += owner
+            if first_move is not None:
+                move_stats = stats.first_moves.setdefault(first_move, [0, 0])
+                move_stats[0] += 1
+                move_stats[1] += black_won == (stats.to_play == 2)
+        results.put(_result(key, size, stats))
+
+
+class Analyzer:
+    """
+    Фоновый анализ позиции в отдельном процессе: игровой цикл только отправляет позицию
+    и забирает готовые результаты, не дожидаясь их.
+    """
+
+    def __init__(self, size: int, seed: int | None = None) -> None:
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._results = context.Queue()
+        self._process = context.Process(target=_worker, args=(size, self._requests, self._results, seed),
+                                        name="go-analysis", daemon=True)
+        self._key: int | None = None
+
+    def start(self) -> None:
+        self._process.start()
+
+    def analyze(self, board: np.ndarray, black_to_move: bool) -> bool:
+        """Ставит позицию на анализ; True, если позиция изменилась."""
+        key = position_hash(board, black_to_move)
+        if key == self._key:
+            return False
+        self._key = key
+        self._requests.put((key, board.astype(int).ravel().tolist(), 2 if black_to_move else 1))
+        return True
+
+    def poll(self) -> AnalysisResult | None:
+        """Последний результат для текущей позиции, если пришёл новый."""
+        latest = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return latest
+            if result.key == self._key:
+                latest = result
+
+    def close(self) -> None:
+        if not self._process.is_alive():
+            return
+        self._requests.put("stop")
+        self._process.join(timeout=1)
+        if self._process.is_alive():
+            self._process.terminate()
+
+
+def benchmark(size: int, playouts: int) -> None:
+    neighbours = _neighbours(size)
+    rng = random.Random(0)
+    cells = [0] * (size * size)
+    started = time.perf_counter()
+    for _ in range(playouts):
+        playout(cells, neighbours, 2, rng)
+    elapsed = time.perf_counter() - started
+    print(f"{size}x{size}: {playouts / elapsed:.0f} партий/с ({elapsed / playouts * 1000:.2f} мс на партию)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Скорость случайных партий для анализа")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[9, 19])
+    parser.add_argument("--playouts", type=int, default=200)
+    args = parser.parse_args()
+    for board_size in args.sizes:
+        benchmark(board_size, args.playouts)
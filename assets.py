@@ -0,0 +1,106 @@
+import os
+from dataclasses import dataclass
+
+import pygame
+
+from settings import *
+
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+HOVER_ALPHA = 110
+LAST_MOVE_MARK_RADIUS = 0.18  # доля размера камня
+
+
+@dataclass(frozen=True)
+class StoneSprites:
+    black: pygame.Surface
+    white: pygame.Surface
+    black_hover: pygame.Surface
+    white_hover: pygame.Surface
+    black_last: pygame.Surface
+    white_last: pygame.Surface
+
+    def for_color(self, board_value: int) -> pygame.Surface:
+        return self.white if board_value == 1 else self.black
+
+    def hover_for_color(self, board_value: int) -> pygame.Surface:
+        return self.white_hover if board_value == 1 else self.black_hover
+
+    def last_for_color(self, board_value: int) -> pygame.Surface:
+        return self.white_last if board_value == 1 else self.black_last
+
+
+# Кэши на весь процесс: картинки читаются с диска один раз,
+# спрайты масштабируются один раз на каждый размер камня
+_images: dict[str, pygame.Surface] = {}
+_sprites: dict[int, StoneSprites] = {}
+_fonts: dict[tuple[str | None, int], pygame.font.Font] = {}
+
+
+def get_image(name: str) -> pygame.Surface:
+    image = _images.get(name)
+    if image is None:
+        image = pygame.image.load(os.path.join(ASSETS_DIR, name))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        _images[name] = image
+    return image
+
+
+def _make_hover(sprite: pygame.Surface) -> pygame.Surface:
+    hover = sprite.copy()
+    hover.fill((255, 255, 255, HOVER_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+    return hover
+
+
+def _make_last(sprite: pygame.Surface, mark_color: Rgb) -> pygame.Surface:
+    last = sprite.copy()
+    center = (last.get_width() // 2, last.get_height() // 2)
+    radius = max(2, int(last.get_width() * LAST_MOVE_MARK_RADIUS))
+    pygame.draw.circle(last, (mark_color.r, mark_color.g, mark_color.b), center, radius, width=2)
+    return last
+
+
+def get_stone_sprites(stone_size: int) -> StoneSprites:
+    """
+    Спрайты камней заданного размера (обычные, полупрозрачные для наведения и с меткой последнего хода).
+    """
+    sprites = _sprites.get(stone_size)
+    if sprites is None:
+        black = pygame.transform.scale(get_image("black_stone.png"), (stone_size, stone_size))
+        white = pygame.transform.scale(get_image("white_stone.png"), (stone_size, stone_size))
+        sprites = StoneSprites(
+            black=black,
+            white=white,
+            black_hover=_make_hover(black),
+            white_hover=_make_hover(white),
+            black_last=_make_last(black, WHITE),
+            white_last=_make_last(white, BLACK),
+        )
+        _sprites[stone_size] = sprites
+    return sprites
+
+
+def preload_stone_sprites() -> None:
+    """Готовит спрайты для всех размеров доски, чтобы переход из меню в игру не трогал диск."""
+    for size in BOARD_SIZES:
+        get_stone_sprites(int(STONE_RADIUS * 2 * board_scale[size]))
+
+
+def get_font(name: str | None, size: int) -> pygame.font.Font:
+    font = _fonts.get((name, size))
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[(name, size)] = font
+    return font
+
+
+def get_screen(size: tuple[int, int] = (0, 0), flags: int = 0) -> pygame.Surface:
+    """
+    Возвращает уже открытое окно, если оно подходит, иначе открывает новое.
+    """
+    if not pygame.get_init():
+        pygame.init()
+    screen = pygame.display.get_surface()
+    if screen is not None and (size == (0, 0) or screen.get_size() == size):
+        return screen
+    return pygame.display.set_mode(size, flags)
@@ -0,0 +1,167 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from settings import *
+
+NS_PER_S = 1_000_000_000
+
+
+@dataclass(frozen=True)
+class TimeControl:
+    kind: str
+    main_time_s: float
+    increment_s: float = 0.0
+    periods: int = 0
+    period_time_s: float = 0.0
+
+
+def default_time_control() -> TimeControl:
+    return TimeControl(TIME_CONTROL_KIND, TIME_MAIN_S, TIME_INCREMENT_S, TIME_PERIODS, TIME_PERIOD_S)
+
+
+@dataclass
+class PlayerTime:
+    main_ns: int
+    periods: int
+    period_ns: int
+    flagged: bool = False
+
+
+class GameClock:
+    """
+    Шахматные часы партии: абсолютный контроль, Фишер или японское бёё-ёми.
+    Время считается по монотонному таймеру (time.perf_counter_ns).
+    """
+
+    def __init__(self, control: TimeControl, timer: Callable[[], int] = time.perf_counter_ns) -> None:
+        self._control = control
+        self._timer = timer
+        self._period_full_ns = int(control.period_time_s * NS_PER_S)
+        self._players = {
+            color: PlayerTime(int(control.main_time_s * NS_PER_S), control.periods, self._period_full_ns)
+            for color in (Colors.BLACK, Colors.WHITE)
+        }
+        self._running: str | None = None
+        self._started_ns = 0
+
+    @property
+    def control(self) -> TimeControl:
+        return self._control
+
+    @property
+    def running(self) -> str | None:
+        return self._running
+
+    def start(self, color: str) -> None:
+        self._running = color
+        self._started_ns = self._timer()
+
+    def stop(self) -> None:
+        if self._running is not None:
+            self._charge(self._players[self._running], self._timer() - self._started_ns)
+            self._running = None
+
+    def _charge(self, player: PlayerTime, elapsed_ns: int) -> None:
+        if player.flagged:
+            return
+        if player.main_ns >= elapsed_ns:
+            player.main_ns -= elapsed_ns
+            return
+        elapsed_ns -= player.main_ns
+        player.main_ns = 0
+        if self._control.kind != TimeControlKind.BYOYOMI:
+            player.flagged = True
+            return
+        # Бёё-ёми: каждый полностью истраченный период сгорает
+        while player.periods > 0 and elapsed_ns >= player.period_ns:
+            elapsed_ns -= player.period_ns
+            player.periods -= 1
+            player.period_ns = self._period_full_ns
+        if player.periods == 0:
+            player.flagged = True
+        else:
+            player.period_ns -= elapsed_ns
+
+    def switch(self, to_color: str, completed_move: bool = True) -> PlayerTime | None:
+        """
+        Ход сделан: списывает время ходившего, начисляет добавку или обновляет период и запускает часы to_color.
+        completed_move=False — ход перешёл без хода (отмена, возврат хода): время списывается, но ни добавки,
+        ни нового периода нет. Возвращает оставшееся время ходившего.
+        """
+        mover = self._running
+        now = self._timer()
+        result = None
+        if mover is not None and mover != to_color:
+            player = self._players[mover]
+            self._charge(player, now - self._started_ns)
+            if not player.flagged and completed_move:
+                if self._control.kind == TimeControlKind.FISCHER:
+                    player.main_ns += int(self._control.increment_s * NS_PER_S)
+                elif self._control.kind == TimeControlKind.BYOYOMI and player.main_ns == 0:
+                    player.period_ns = self._period_full_ns
+            result = PlayerTime(player.main_ns, player.periods, player.period_ns, player.flagged)
+        elif mover == to_color:
+            return None
+        self._running = to_color
+        self._started_ns = now
+        return result
+
+    def remaining(self, color: str) -> PlayerTime:
+        """Оставшееся время с учётом идущих часов (без изменения состояния)."""
+        player = self._players[color]
+        current = PlayerTime(player.main_ns, player.periods, player.period_ns, player.flagged)
+        if color == self._running:
+            self._charge(current, self._timer() - self._started_ns)
+        return current
+
+    def set_remaining(self, color: str, main_ns: int, periods: int, period_ns: int) -> None:
+        """Синхронизация с соперником по сети: его часы берутся из его отметки времени в ходе."""
+        player = self._players[color]
+        player.main_ns, player.periods, player.period_ns = main_ns, periods, period_ns
+        player.flagged = False
+        if color == self._running:
+            self._started_ns = self._timer()
+
+    def flagged(self) -> str | None:
+        for color in (Colors.BLACK, Colors.WHITE):
+            if self.remaining(color).flagged:
+                return color
+        return None
+
+    def format(self, color: str) -> str:
+        player = self.remaining(color)
+        if player.flagged:
+            return "время вышло"
+        if player.main_ns > 0 or self._control.kind != TimeControlKind.BYOYOMI:
+            return _format_seconds(player.main_ns / NS_PER_S)
+        return f"{player.periods}×{_format_seconds(player.period_ns / NS_PER_S)}"
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = max(0, int(seconds + 0.999))  # округляем вверх, как на настоящих часах
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def allocate_move_time(clock: GameClock, color: str, board_size: int, moves_played: int) -> float:
+    """
+    Бюджет на обдумывание хода компьютера, с: доля основного времени на ожидаемое число оставшихся ходов,
+    плюс большая часть добавки; в бёё-ёми — большая часть периода.
+    """
+    player = clock.remaining(color)
+    control = clock.control
+    if player.flagged:
+        return 0.0
+    if player.main_ns == 0 and control.kind == TimeControlKind.BYOYOMI:
+        return player.period_ns / NS_PER_S * AI_TIME_SAFETY
+    main_s = player.main_ns / NS_PER_S
+    # Ожидаемое число своих ходов до конца партии
+    moves_left = max(AI_MIN_MOVES_LEFT, (board_size * board_size * 0.6 - moves_played) / 2)
+    budget = main_s / moves_left
+    if control.kind == TimeControlKind.FISCHER:
+        budget += control.increment_s * AI_TIME_SAFETY
+    elif control.kind == TimeControlKind.BYOYOMI and control.periods:
+        # Периоды бёё-ёми всё равно останутся: тратить меньше одного периода незачем
+        return max(budget, control.period_time_s * AI_TIME_SAFETY)
+    return min(budget, main_s * AI_TIME_SAFETY)
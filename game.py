@@ -1,58 +1,97 @@
 import collections
 import random
 import sys
+from typing import TYPE_CHECKING
+
 import numpy as np
 import pygame
+from ai import ComputerPlayer
+from assets import get_font, get_screen
+from clocks import GameClock, allocate_move_time, default_time_control
+from geometry import BoardGeometry, board_offset, get_geometry, invalidate_geometry
+from journal import OP_PASS, OP_PLACE, OP_REDO, OP_TURN, OP_UNDO, GameJournal, GameState, get_journal
 from main_logic import game_logic
-from networker import NetworkManager
+from patterns import PatternWeights
 from point import Point
 from renderer import Renderer
+from transposition import TranspositionTable
 from settings import *
 
+if TYPE_CHECKING:
+    from analysis import Analyzer
+    from networker import NetworkStats
+
 
 class Game:
-    def __init__(self, size: int, mode: str) -> None:
+    def __init__(self, size: int, mode: str, seed: int | None = None) -> None:
+        # Воспроизводимый режим: с зерном компьютер играет одинаково и не ограничен часами
+        self._reproducible: bool = seed is not None
+        self._rng: random.Random = random.Random(seed)
         self._logic: game_logic = game_logic(size)
+        # Общая таблица транспозиций хранит позиции прошлых партий, поэтому воспроизводимой партии нужна своя.
+        # Книга и веса шаблонов читаются из файлов, которых может не быть: с зерном они не используются
+        if self._reproducible:
+            self._ai: ComputerPlayer = ComputerPlayer(size, rng=self._rng, transpositions=TranspositionTable(),
+                                                      use_book=False, weights=PatternWeights())
+        else:
+            self._ai: ComputerPlayer = ComputerPlayer(size, rng=self._rng)
         self._board: np.ndarray = np.zeros((size, size))
         self._size: int = size
         self._black_turn: bool = False
         self._prisoners: collections.defaultdict = collections.defaultdict(int)
-        self._start_points, self._end_points = self._logic.get_grid_points(self._size)
         self._mode: str = mode
         self._move_log: list[str] = []
         self._esc_button_hovered: bool = False
         self._last_move: Point = Point(0, 0)
         self._redo_flag: bool = False
         self._last_log: str | None = None
+        self._hover: tuple[int, int] | None = None
+        self._clock: GameClock = GameClock(default_time_control())
 
         self._screen: pygame.Surface | None = None
         self._font: pygame.font.Font | None = None
         self._board_offset_x: int | None = None
         self._board_offset_y: int | None = None
+        self._geometry: BoardGeometry | None = None
 
         self._renderer: Renderer | None = None
 
+        self._network_manager: 'NetworkManager | None' = None
         if self._mode == GameModes.ONLINE:
-            self._network_manager: NetworkManager | None = NetworkManager(self._mode, None, None)
-        else:
-            self._network_manager: NetworkManager | None = None
+            # Сетевой код нужен только в онлайн-режиме
+            from networker import NetworkManager
+            self._network_manager = NetworkManager(self._mode, None, None)
 
         self._player_color: str | None = None
         self._opponent_color: str | None = None
 
+        # Фоновый анализ позиции (процесс запускается в init_pygame)
+        self._analyzer: Analyzer | None = None
+        if self._mode == GameModes.ANALYSIS:
+            from analysis import Analyzer
+            self._analyzer = Analyzer(size, seed)
+
+        # Автосохранение: сетевую партию продолжить после перезапуска нельзя, поэтому она не журналируется
+        # вовсе (в том числе при выходе через sys.exit в networker по ошибке сети)
+        self._journal: GameJournal | None = get_journal() if self._mode != GameModes.ONLINE else None
+        self._journal_turn: bool = self._black_turn
+        if self._journal:
+            self._journal.start(self._game_state())
+
     def _calculate_scale_factor(self) -> float:
         return board_scale[self._size]
 
     def init_pygame(self) -> None:
-        pygame.init()
+        if not pygame.get_init():
+            pygame.init()
         screen_info: pygame.display.Info = pygame.display.Info()
         screen_width: int = screen_info.current_w
         screen_height: int = screen_info.current_h
-        self._screen: pygame.Surface = pygame.display.set_mode((screen_width, screen_height))
-        self._font: pygame.font.Font = pygame.font.SysFont("Comic Sans", 30)
+        self._screen: pygame.Surface = get_screen((screen_width, screen_height))
+        self._font: pygame.font.Font = get_font("Comic Sans", 30)
 
-        self._board_offset_x: int = (screen_width - BOARD_WIDTH) // 2
-        self._board_offset_y: int = (screen_height - BOARD_WIDTH) // 2
+        self._board_offset_x, self._board_offset_y = board_offset(screen_width, screen_height)
+        self._geometry = get_geometry(self._size, self._board_offset_x, self._board_offset_y)
 
         # Инициализируем Renderer
         self._renderer = Renderer(self._size, self._screen, self._board_offset_x, self._board_offset_y, self._font)
@@ -64,19 +103,89 @@ class Game:
             self._player_color = self._network_manager._player_color
             self._opponent_color = self._network_manager._opponent_color
             self._black_turn = True  # Черные ходят первыми
+        if self._analyzer:
+            self._analyzer.start()
+        else:
+            self._clock.start(self._turn_color())
+
+    def _handle_resize(self, width: int, height: int) -> None:
+        invalidate_geometry()
+        self._screen = pygame.display.get_surface()
+        self._board_offset_x, self._board_offset_y = board_offset(width, height)
+        self._geometry = get_geometry(self._size, self._board_offset_x, self._board_offset_y)
+        self._renderer.resize(self._screen, self._board_offset_x, self._board_offset_y)
+        self.draw()
+
+    def _game_state(self) -> GameState:
+        return GameState(
+            size=self._size,
+            mode=self._mode,
+            board=self._board.copy(),
+            prisoners={"white": self._prisoners["white"], "black": self._prisoners["black"]},
+            black_turn=self._black_turn,
+            move_log=list(self._move_log),
+            last_move=(self._last_move.x, self._last_move.y),
+        )
+
+    def restore(self, state: GameState) -> None:
+        """Продолжение сохранённой партии."""
+        self._board = state.board.copy()
+        self._prisoners.update(state.prisoners)
+        self._black_turn = state.black_turn
+        self._move_log = list(state.move_log)
+        if state.last_move is not None:
+            self._last_move = Point(*state.last_move)
+        self._journal_turn = self._black_turn
+        if self._journal:
+            self._journal.start(self._game_state())
+        if not self._analyzer:
+            self._clock.start(self._turn_color())
+
+    def _journal_record(self, op: int, color_code: int = 0, col: int = 0, row: int = 0) -> None:
+        if not self._journal:
+            return
+        self._journal.append(op, color_code, col, row)
+        if self._journal.snapshot_due():
+            self._journal.snapshot(self._game_state())
+
+    def _sync_journal_turn(self) -> None:
+        if self._journal and self._black_turn != self._journal_turn:
+            self._journal_turn = self._black_turn
+            self._journal_record(OP_TURN, int(self._black_turn))
+
+    def _turn_color(self) -> str:
+        return Colors.BLACK if self._black_turn else Colors.WHITE
+
+    def _switch_clock(self, completed_move: bool = True) -> None:
+        """
+        Переключает часы на того, чей сейчас ход: после хода или паса; после отмены и возврата хода
+        (completed_move=False) — без добавки времени.
+        """
+        if self._clock.running is not None and self._clock.running != self._turn_color():
+            self._clock.switch(self._turn_color(), completed_move)
+
+    def _computer_delay(self) -> None:
+        """Пауза перед ходом компьютера: часы стоят, чтобы она не шла в его время."""
+        self._clock.stop()
+        self.draw()
+        pygame.time.wait(1000)
+        self._clock.start(self._turn_color())
 
     def _pass_turn(self) -> None:
+        self._journal_record(OP_PASS)
         self._black_turn = not self._black_turn
         self.draw()
 
     def _handle_stone_placement(self) -> None:
         x, y = pygame.mouse.get_pos()
-        x -= self._board_offset_x
-        y -= self._board_offset_y
-        point = Point(x, y)
-        col, row = self._logic.point_to_colrow(point)
+        hit = self._geometry.hit_test(x, y)
+        if hit is None:
+            return
+        col, row = hit
         if not self._logic.is_valid_move(col, row, self._board):
             return
+        if self._clock.flagged() is not None:
+            return  # Партия окончена по времени
         self._last_move = Point(col, row)
         self._board[col, row] = 1 if not self._black_turn else 2
         self._redo_flag = False
@@ -93,8 +202,8 @@ class Game:
             if not self._black_turn:
                 # Ход компьютера в "легком" режиме
                 self._black_turn = True
-                self.draw()
-                pygame.time.wait(1000)
+                self._switch_clock()
+                self._computer_delay()
                 self._computer_move()
             else:
                 self._black_turn = False
@@ -102,145 +211,59 @@ class Game:
             if not self._black_turn:
                 # Ход компьютера в "сложном" режиме
                 self._black_turn = True
-                self.draw()
-                pygame.time.wait(1000)
+                self._switch_clock()
+                self._computer_delay()
                 self._smart_computer_move()  # Вызов сложного хода компьютера
             else:
                 self._black_turn = False
-        elif self._mode == GameModes.PVP:
+        elif self._mode in (GameModes.PVP, GameModes.ANALYSIS):
             # Если PVP, переключаем ход
             self._black_turn = not self._black_turn
         elif self._mode == GameModes.ONLINE:
-            # Отправляем ход оппоненту
-            move_str = f"{col},{row}"
-            self._network_manager.send_move(move_str)
+            # Отправляем ход оппоненту вместе с оставшимся временем на наших часах
             self._black_turn = not self._black_turn
+            self._switch_clock()
+            remaining = self._clock.remaining(self._player_color)
+            move_str = f"{col},{row}"
+            self._network_manager.send_move(move_str, (remaining.main_ns, remaining.periods, remaining.period_ns))
             self.draw()
 
         self.draw()
 
     def _handle_captures(self, col: int, row: int) -> None:
+        self._journal_record(OP_PLACE, int(self._board[col, row]), col, row)
         self_color: str = 'white' if not self._black_turn else 'black'
-        other_color: str = 'black' if not self._black_turn else 'white'
-        capture_happened: bool = False
-
-        # Проверка, не захвачены ли камни противника
-        for group in self._logic.get_stone_groups(self._board, other_color):
-            if self._logic.stone_group_has_no_liberties(self._board, group):
-                capture_happened = True
-                for point in group:
-                    self._board[point.x, point.y] = 0
-                self._prisoners[self_color] += len(group)
-
-        if not capture_happened:
-            group = None
-            # Проверка, захватил ли недавно установленный камень свою собственную группу
-            for current_group in self._logic.get_stone_groups(self._board, self_color):
-                if Point(col, row) in current_group:
-                    group = current_group
-                    break
-            if group and self._logic.stone_group_has_no_liberties(self._board, group):
-                self._board[col, row] = 0
+        self._prisoners[self_color] += self._logic.resolve_captures(self._board, col, row)
 
     def _computer_move(self) -> None:
-        valid_moves: list[Point] = []
-        for col in range(self._size):
-            for row in range(self._size):
-                if self._logic.is_valid_move(col, row, self._board):
-                    valid_moves.append(Point(col, row))
-
-        if valid_moves:
-            chosen_move: Point = random.choice(valid_moves)
-            chosen_col, chosen_row = chosen_move.x, chosen_move.y
-            self._board[chosen_col, chosen_row] = 2
-            self._handle_captures(chosen_col, chosen_row)
-
-            self._move_log.insert(0, f"Чёрные: {chosen_col + 1}, {chosen_row + 1}")
-            if len(self._move_log) > 4:
-                self._move_log.pop()
-
-            self.draw()
-            self._black_turn = False  # Возвращаем ход игроку
+        if self._clock.flagged() is not None:
+            return  # Партия окончена по времени
+        chosen_move = self._ai.random_move(self._board)
+        if chosen_move is not None:
+            self._play_computer_move(*chosen_move)
 
     def _smart_computer_move(self) -> None:
-        best_move: tuple[int, int] | None = None
-        best_score: int = -1  # Начальная оценка
-
-        # Перебор всех возможных ходов
-        for col in range(self._size):
-            for row in range(self._size):
-                if not self._logic.is_valid_move(col, row, self._board):
-                    continue  # Пропускаем недопустимые ходы
-
-                # Симуляция хода: копирование доски и размещение камня
-                temp_board = self._board.copy()
-                temp_board[col, row] = 2  # Черный камень
-
-                # Симуляция захватов камней противника
-                captures = self._simulate_captures(temp_board, opponent_color="white")
-
-                # Подсчет либертей для группы камней после хода
-                group = self._logic.get_group(temp_board, Point(col, row))
-                liberties = self._logic.count_liberties(temp_board, group)
-
-                # Оценка хода: приоритет захватов, затем либертей
-                score = captures * 10 + liberties  # Вес захватов больше, чем либертей
-
-                # Выбор хода с наивысшей оценкой
-                if score > best_score:
-                    best_score = score
-                    best_move = (col, row)
-
-        # Если ни один ход не привел к захватам, выбираем ход с максимальными либертями
-        if best_move is None:
-            max_liberties = -1
-            for col in range(self._size):
-                for row in range(self._size):
-                    if not self._logic.is_valid_move(col, row, self._board):
-                        continue
-
-                    # Симуляция хода
-                    temp_board = self._board.copy()
-                    temp_board[col, row] = 2  # Черный камень
-
-                    # Подсчет либертей для группы камней после хода
-                    group = self._logic.get_group(temp_board, Point(col, row))
-                    liberties = self._logic.count_liberties(temp_board, group)
-
-                    # Выбор хода с наибольшим количеством либертей
-                    if liberties > max_liberties:
-                        max_liberties = liberties
-                        best_move = (col, row)
-
-        # Если ни один из критериев не сработал, выбираем случайный допустимый ход
-        if best_move is None:
-            valid_moves = [(col, row) for col in range(self._size) for row in range(self._size)
-                           if self._logic.is_valid_move(col, row, self._board)]
-            if valid_moves:
-                best_move = random.choice(valid_moves)
+        if self._clock.flagged() is not None:
+            return  # Партия окончена по времени
+        # Время на обдумывание распределяется по оставшемуся на часах чёрных
+        time_budget = None if self._reproducible else \
+            allocate_move_time(self._clock, Colors.BLACK, self._size, int(np.count_nonzero(self._board)))
+        best_move = self._ai.best_move(self._board, 2, time_budget)
 
         # Совершение выбранного хода
         if best_move:
-            col, row = best_move
-            self._board[col, row] = 2  # Размещение черного камня
-            self._handle_captures(col, row)  # Обработка захватов
-            self._move_log.insert(0, f"Чёрные: {col + 1}, {row + 1}")
-            if len(self._move_log) > 4:
-                self._move_log.pop()
-            self.draw()  # Обновление экрана
-            self._black_turn = False  # Передача хода игроку
+            self._play_computer_move(*best_move)
         else:
             print("Компьютер не смог найти ход.")  # Для отладки
 
-    def _simulate_captures(self, temp_board: np.ndarray, opponent_color: str) -> int:
-        captures = 0
-        opponent_groups = self._logic.get_stone_groups(temp_board, opponent_color)
-        for group in opponent_groups:
-            if self._logic.stone_group_has_no_liberties(temp_board, group):
-                captures += len(group)
-                for i, j in group:
-                    temp_board[i, j] = 0  # Захват камней противника
-        return captures
+    def _play_computer_move(self, col: int, row: int) -> None:
+        self._board[col, row] = 2  # Размещение черного камня
+        self._handle_captures(col, row)  # Обработка захватов
+        self._move_log.insert(0, f"Чёрные: {col + 1},{row + 1}")
+        if len(self._move_log) > 4:
+            self._move_log.pop()
+        self.draw()  # Обновление экрана
+        self._black_turn = False  # Передача хода игроку
 
     def draw(self) -> None:
         self._renderer.draw(
@@ -249,11 +272,34 @@ class Game:
             self._black_turn,
             self._move_log,
             self._esc_button_hovered,
-            self._start_points,
-            self._end_points,
-            self._mode
+            self._mode,
+            (self._last_move.x, self._last_move.y) if self._move_log else None,
+            self._hover,
+            self.network_stats(),
+            self._clock if not self._analyzer else None
         )
 
+    def network_stats(self) -> 'NetworkStats | None':
+        """Статистика соединения в сетевой игре (RTT, смещение часов, трафик) или None."""
+        if self._network_manager and self._network_manager._conn:
+            return self._network_manager.get_stats()
+        return None
+
+    def _update_analysis(self) -> None:
+        """Отправляет позицию на анализ при изменении и забирает новые результаты без ожидания."""
+        if self._analyzer.analyze(self._board, self._black_turn):
+            self._renderer.set_analysis(None)  # результаты прежней позиции больше не верны
+            self.draw()
+        result = self._analyzer.poll()
+        if result is not None:
+            self._renderer.draw_analysis(result)
+
+    def _leave(self) -> None:
+        """Выход из партии (в меню или из программы)."""
+        self._sync_journal_turn()
+        if self._analyzer:
+            self._analyzer.close()
+
     def update(self) -> bool | None:
         events: list[pygame.event.Event] = pygame.event.get()
         for event in events:
@@ -273,15 +319,22 @@ class Game:
                     if redo_button_rect.collidepoint(mouse_x, mouse_y):
                         self._redo()
                     if esc_button_rect.collidepoint(mouse_x, mouse_y):
+                        self._leave()
                         return True
                     if self._mode != GameModes.ONLINE or (self._mode == GameModes.ONLINE and self._player_color == (
                             'black' if self._black_turn else 'white')):
                         self._handle_stone_placement()
             if event.type == pygame.QUIT:
+                self._leave()
+                if self._journal:
+                    self._journal.close()
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.VIDEORESIZE:
+                self._handle_resize(event.w, event.h)
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_ESCAPE:
+                    self._leave()
                     return True
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
@@ -303,6 +356,10 @@ class Game:
             if self._esc_button_hovered:
                 self._esc_button_hovered = False
                 self.draw()
+        hover = self._geometry.hit_test(mouse_x, mouse_y)
+        if hover != self._hover:
+            self._hover = hover
+            self.draw()
 
         # Обработка сетевых данных
         if self._mode == GameModes.ONLINE:
@@ -318,9 +375,22 @@ class Game:
                     if len(self._move_log) > 4:
                         self._move_log.pop()
                     self._black_turn = not self._black_turn
+                    self._switch_clock()
+                    # Часы соперника берём из его отметки времени: так они не расходятся на задержку сети
+                    if self._network_manager.last_move_clock is not None:
+                        self._clock.set_remaining(self._opponent_color, *self._network_manager.last_move_clock)
                     self.draw()
 
-        self.draw()
+        self._switch_clock()
+        self._sync_journal_turn()
+        if self._analyzer:
+            self._update_analysis()
+        else:
+            # Каждый тик перерисовываются только часы и статистика сети; доска — лишь при изменениях
+            self._renderer.draw_clock(self._clock)
+            network_stats = self.network_stats()
+            if network_stats is not None:
+                self._renderer.draw_network_stats(network_stats)
 
         pygame.time.wait(100)
 
@@ -328,7 +398,8 @@ class Game:
         if self._last_move is not None:
             if len(self._move_log) > 0:
                 self._last_log = self._move_log[0]
-            if not self._redo_flag:
+            popped = not self._redo_flag and len(self._move_log) > 0
+            if popped:
                 self._move_log.pop(0)
             if self._last_move is not None:
                 if self._board[self._last_move.x, self._last_move.y] == 1:
@@ -337,16 +408,22 @@ class Game:
                     self._black_turn = True
             if self._last_move is not None:
                 self._board[self._last_move.x, self._last_move.y] = 0
+                self._journal_record(OP_UNDO, int(popped), self._last_move.x, self._last_move.y)
+            self._switch_clock(completed_move=False)
             self._redo_flag = True
             self.draw()
 
     def _redo(self) -> None:
         if self._redo_flag and self._last_log is not None and self._last_move is not None:
             self._board[self._last_move.x, self._last_move.y] = 2 if self._black_turn else 1
+            self._journal_record(OP_REDO, 2 if self._black_turn else 1, self._last_move.x, self._last_move.y)
             self._move_log.insert(0, self._last_log)
+            if len(self._move_log) > 4:
+                self._move_log.pop()
             if self._black_turn:
                 self._black_turn = False
             else:
                 self._black_turn = True
+            self._switch_clock(completed_move=False)
             self.draw()
             self._redo_flag = False
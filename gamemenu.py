@@ -1,21 +1,27 @@
 import pygame
 from settings import *
 import sys
+import startup
 from rgb import Rgb
+from assets import get_font, get_screen, preload_stone_sprites
 
 
 class GameMenu:
-    def __init__(self):
-        pygame.init()
-        self.screen: pygame.Surface = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.font: pygame.font.Font = pygame.font.SysFont("Comic Sans", 50)
-        self.title_font: pygame.font.Font = pygame.font.SysFont("Comic Sans", 100)
+    def __init__(self, saved_game: tuple[int, str] | None = None):
+        self.screen: pygame.Surface = get_screen((0, 0), pygame.FULLSCREEN)
+        self.font: pygame.font.Font = get_font("Comic Sans", 50)
+        self.title_font: pygame.font.Font = get_font("Comic Sans", 100)
         self.selected_size_index: int = 0
         self.selected_mode_index: int = 0
         self.size_spacing: int = 40
         self.mode_spacing: int = 60
         self.BOARD_SIZES: list[int] = [8, 9, 13, 19]
-        self.GAME_MODES: list[str] = ["Игрок против игрока", "Лёгкий", "Сложный", "Играть по сети"]
+        self.GAME_MODES: list[str] = ["Игрок против игрока", "Лёгкий", "Сложный", "Играть по сети", "Анализ"]
+        self.saved_game: tuple[int, str] | None = saved_game
+        self.resume_requested: bool = False
+
+    def _resume_button_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.screen.get_width() // 2 + 120, self.screen.get_height() // 4 + 100, 280, 60)
 
     def _draw_title(self) -> None:
         title_text: pygame.Surface = self.title_font.render("GO", True, (BLACK.r, BLACK.g, BLACK.b))
@@ -38,6 +44,13 @@ class GameMenu:
         exit_text_rect: pygame.Rect = exit_button_text.get_rect(center=exit_button_rect.center)
         self.screen.blit(exit_button_text, exit_text_rect)
 
+        if self.saved_game is not None:
+            resume_button_rect: pygame.Rect = self._resume_button_rect()
+            pygame.draw.rect(self.screen, (BUTTON_COLOR.r, BUTTON_COLOR.g, BUTTON_COLOR.b), resume_button_rect)
+            resume_button_text: pygame.Surface = self.font.render("Продолжить", True, (BLACK.r, BLACK.g, BLACK.b))
+            resume_text_rect: pygame.Rect = resume_button_text.get_rect(center=resume_button_rect.center)
+            self.screen.blit(resume_button_text, resume_text_rect)
+
     def _draw_selecting_options(self) -> None:
         subtitle: pygame.Surface = self.font.render("Выберите размер поля и режим игры:", True,
                                                     (BLACK.r, BLACK.g, BLACK.b))
@@ -78,11 +91,21 @@ class GameMenu:
             self.screen.blit(mode_text, rect)
         return mode_rects
 
+    def _prepare_geometry(self, size: int) -> None:
+        # Заранее строим геометрию доски, которую будут использовать Game и Renderer.
+        # numpy импортируется здесь, а не при загрузке меню
+        from geometry import board_offset, get_geometry
+        offset_x, offset_y = board_offset(self.screen.get_width(), self.screen.get_height())
+        get_geometry(size, offset_x, offset_y)
+
     def _handle_events(self, size_rects: list[pygame.Rect], mode_rects: list[pygame.Rect]) -> tuple[int, str] | None:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.VIDEORESIZE:
+                from geometry import invalidate_geometry
+                invalidate_geometry()
             if event.type == pygame.MOUSEBUTTONUP:
                 if event.button == 1:
                     mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -97,8 +120,14 @@ class GameMenu:
                     play_button_rect: pygame.Rect = pygame.Rect(self.screen.get_width() // 2 - 100,
                                                                 self.screen.get_height() // 4 + 100, 200, 60)
                     if play_button_rect.collidepoint(mouse_x, mouse_y):
+                        self._prepare_geometry(self.BOARD_SIZES[self.selected_size_index])
                         return self.BOARD_SIZES[self.selected_size_index], self.GAME_MODES[self.selected_mode_index]
 
+                    if self.saved_game is not None and self._resume_button_rect().collidepoint(mouse_x, mouse_y):
+                        self.resume_requested = True
+                        self._prepare_geometry(self.saved_game[0])
+                        return self.saved_game
+
                     exit_button_rect: pygame.Rect = pygame.Rect(self.screen.get_width() // 2 - 100,
                                                                 self.screen.get_height() // 4 + 180, 200, 60)
                     if exit_button_rect.collidepoint(mouse_x, mouse_y):
@@ -117,7 +146,9 @@ class GameMenu:
             mode_rects: list[pygame.Rect] = self._draw_mode_options()
 
             pygame.display.flip()
+            startup.first_menu_frame()
 
             result: tuple[int, str] | None = self._handle_events(size_rects, mode_rects)
             if result:
+                preload_stone_sprites()
                 return result
@@ -0,0 +1,101 @@
+import numpy as np
+from point import Point
+from settings import *
+
+
+class BoardGeometry:
+    """
+    Предвычисленная геометрия доски: экранные координаты всех пересечений,
+    концы линий сетки и размер камня для заданного размера доски, смещения и масштаба.
+    """
+
+    def __init__(self, size: int, offset_x: int = 0, offset_y: int = 0, scale: float | None = None) -> None:
+        self._size = size
+        self._offset_x = offset_x
+        self._offset_y = offset_y
+        self._scale = board_scale.get(size, 1) if scale is None else scale
+        self._inc = (BOARD_WIDTH - 2 * BOARD_BORDER) / (size - 1)
+
+        # Координаты пересечений (как раньше в colrow_to_point: int(BOARD_BORDER + i * inc))
+        coords = (BOARD_BORDER + np.arange(size) * self._inc).astype(np.int32)
+        self._pixels = np.empty((size, size, 2), dtype=np.int32)
+        self._pixels[:, :, 0] = (coords + offset_x)[:, np.newaxis]
+        self._pixels[:, :, 1] = (coords + offset_y)[np.newaxis, :]
+        self._pixel_list: list[list[list[int]]] = self._pixels.tolist()
+
+        self._start_points, self._end_points = self._build_grid_lines()
+        self._stone_size = int(STONE_RADIUS * 2 * self._scale)
+
+    def _build_grid_lines(self) -> tuple[list[Point], list[Point]]:
+        low = BOARD_BORDER
+        high = BOARD_WIDTH - BOARD_BORDER
+        lines = np.linspace(low, high, self._size)
+        start_points: list[Point] = []
+        end_points: list[Point] = []
+        # Вертикальные линии, затем горизонтальные
+        for x in lines:
+            start_points.append(Point(x + self._offset_x, low + self._offset_y))
+            end_points.append(Point(x + self._offset_x, high + self._offset_y))
+        for y in lines:
+            start_points.append(Point(low + self._offset_x, y + self._offset_y))
+            end_points.append(Point(high + self._offset_x, y + self._offset_y))
+        return start_points, end_points
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """Массив (size, size, 2) экранных координат пересечений."""
+        return self._pixels
+
+    @property
+    def stone_size(self) -> int:
+        return self._stone_size
+
+    @property
+    def grid_lines(self) -> tuple[list[Point], list[Point]]:
+        return self._start_points, self._end_points
+
+    def colrow_to_screen(self, col: int, row: int) -> tuple[int, int]:
+        x, y = self._pixel_list[col][row]
+        return x, y
+
+    def screen_to_colrow(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Ближайшее пересечение к экранной точке, без проверки границ доски.
+        """
+        col = round((x - self._offset_x - BOARD_BORDER) / self._inc)
+        row = round((y - self._offset_y - BOARD_BORDER) / self._inc)
+        return col, row
+
+    def hit_test(self, x: float, y: float) -> tuple[int, int] | None:
+        """
+        Пересечение под курсором мыши за O(1) или None, если точка вне доски.
+        """
+        col, row = self.screen_to_colrow(x, y)
+        if 0 <= col < self._size and 0 <= row < self._size:
+            return col, row
+        return None
+
+
+_geometry_cache: dict[tuple[int, int, int, float | None], BoardGeometry] = {}
+
+
+def get_geometry(size: int, offset_x: int = 0, offset_y: int = 0, scale: float | None = None) -> BoardGeometry:
+    key = (size, offset_x, offset_y, scale)
+    geometry = _geometry_cache.get(key)
+    if geometry is None:
+        geometry = BoardGeometry(size, offset_x, offset_y, scale)
+        _geometry_cache[key] = geometry
+    return geometry
+
+
+def invalidate_geometry() -> None:
+    """Сбрасывает кэш геометрии (например, после изменения размера окна)."""
+    _geometry_cache.clear()
+
+
+def board_offset(screen_width: int, screen_height: int) -> tuple[int, int]:
+    return (screen_width - BOARD_WIDTH) // 2, (screen_height - BOARD_WIDTH) // 2
@@ -1,15 +1,30 @@
+import startup
+import argparse
+import os
+import sys
 import pygame as pg
 from gamemenu import GameMenu
-from game import Game
+from settings import MEMPROF_REPORT_PATH, STARTUP_BUDGET_MS
 
 
-def start_game() -> None:
+def start_game(seed: int | None = None) -> None:
+    from journal import get_journal, peek_saved_game, recover
+
     while True:
-        menu = GameMenu()
+        # Записи прошлой партии в этом процессе могут ещё стоять в очереди фонового потока журнала
+        get_journal().flush()
+        menu = GameMenu(peek_saved_game())
+        startup.mark("menu_ready")
 
         selected_size, selected_mode = menu.show_main_menu()
-        game = Game(size=selected_size, mode=selected_mode)
+        # Сохранение читается до создания Game: новая партия начинает журнал заново
+        saved_state = recover() if menu.resume_requested else None
+        # Игровые модули загружаются только после выбора в меню
+        from game import Game
+        game = Game(size=selected_size, mode=selected_mode, seed=seed)
         game.init_pygame()
+        if saved_state is not None:
+            game.restore(saved_state)
         game.draw()
 
         while True:
@@ -19,5 +34,37 @@ def start_game() -> None:
             pg.time.wait(100)
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Го")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="показать самые долгие импорты (по данным -X importtime)")
+    parser.add_argument("--startup-check", action="store_true",
+                        help="проверить, что первый кадр меню укладывается в бюджет")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS,
+                        help="бюджет времени до первого кадра меню, мс")
+    parser.add_argument("--seed", type=int,
+                        help="воспроизводимый режим: ходы компьютера зависят только от зерна, без отсечки по времени")
+    parser.add_argument("--memprof", nargs="?", const=MEMPROF_REPORT_PATH, metavar="ОТЧЁТ",
+                        help="замер памяти и пауз сборщика по ходам и кадрам, JSON-отчёт при выходе "
+                             "(или переменная окружения GO_MEMPROF)")
+    parser.add_argument("--exit-after-first-frame", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_report:
+        print(startup.import_time_report())
+        return
+    if args.startup_check:
+        sys.exit(0 if startup.check_startup_budget(args.budget) else 1)
+    if args.exit_after_first_frame:
+        startup.exit_after_first_frame = True
+    if args.memprof or os.environ.get("GO_MEMPROF"):
+        import memprof
+        if args.memprof:
+            memprof.install(args.memprof)
+        else:
+            memprof.install_from_env()
+    start_game(args.seed)
+
+
 if __name__ == "__main__":
-    start_game()
+    main()
@@ -0,0 +1,367 @@
+import argparse
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+import traceback
+
+import numpy as np
+
+from ai import ComputerPlayer
+from clocks import NS_PER_S, GameClock, TimeControl, allocate_move_time
+from main_logic import game_logic
+from settings import *
+
+GTP_COLUMNS = "ABCDEFGHJKLMNOPQRSTUVWXYZ"
+GTP_MAX_SIZE = 25
+
+
+class GtpError(Exception):
+    pass
+
+
+def parse_color(text: str) -> int:
+    text = text.lower()
+    if text in ("b", "black"):
+        return 2
+    if text in ("w", "white"):
+        return 1
+    raise GtpError("invalid color")
+
+
+def parse_vertex(text: str, size: int) -> tuple[int, int] | None:
+    """
+    Координата GTP (например, D4) -> (col, row) на доске; None для паса.
+    Строка 1 в GTP — нижняя, на нашей доске row растёт сверху вниз.
+    """
+    text = text.upper()
+    if text == "PASS":
+        return None
+    if len(text) < 2 or text[0] not in GTP_COLUMNS[:size] or not text[1:].isdigit():
+        raise GtpError("invalid vertex")
+    col = GTP_COLUMNS.index(text[0])
+    number = int(text[1:])
+    if not 1 <= number <= size:
+        raise GtpError("invalid vertex")
+    return col, size - number
+
+
+def format_vertex(move: tuple[int, int] | None, size: int) -> str:
+    if move is None:
+        return "pass"
+    col, row = move
+    return f"{GTP_COLUMNS[col]}{size - row}"
+
+
+def area_score(board: np.ndarray, komi: float) -> float:
+    """
+    Подсчёт по площади: камни плюс пустые области, окружённые одним цветом. Больше нуля — ведут чёрные.
+    """
+    size = board.shape[0]
+    cells = board.astype(int).tolist()  # списки быстрее поэлементного доступа к numpy
+    score = {1: 0.0, 2: 0.0}
+    seen = [[False] * size for _ in range(size)]
+    for start_col in range(size):
+        for start_row in range(size):
+            value = cells[start_col][start_row]
+            if value:
+                score[value] += 1
+                continue
+            if seen[start_col][start_row]:
+                continue
+            region = 0
+            borders: set[int] = set()
+            stack = [(start_col, start_row)]
+            seen[start_col][start_row] = True
+            while stack:
+                col, row = stack.pop()
+                region += 1
+                for next_col, next_row in ((col - 1, row), (col + 1, row), (col, row - 1), (col, row + 1)):
+                    if not (0 <= next_col < size and 0 <= next_row < size):
+                        continue
+                    value = cells[next_col][next_row]
+                    if value:
+                        borders.add(value)
+                    elif not seen[next_col][next_row]:
+                        seen[next_col][next_row] = True
+                        stack.append((next_col, next_row))
+            if len(borders) == 1:
+                score[borders.pop()] += region
+    return score[2] - score[1] - komi
+
+
+class GtpEngine:
+    """
+    Движок без интерфейса: правила game_logic и ComputerPlayer за протоколом GTP.
+    """
+
+    def __init__(self, size: int = 19, seed: int | None = None) -> None:
+        self._rng = random.Random(seed)
+        self._komi = 6.5
+        self._time_settings: tuple[float, float, int] | None = None  # основное время, бёё-ёми, камней на период
+        self._time_left: dict[int, tuple[float, int]] = {}
+        self._players: dict[int, ComputerPlayer] = {}
+        self._reset(size)
+        self._commands = {
+            "protocol_version": lambda args: "2",
+            "name": lambda args: "Go",
+            "version": lambda args: "1.0",
+            "known_command": lambda args: "true" if args and args[0] in self._commands else "false",
+            "list_commands": lambda args: "\n".join(self._commands),
+            "quit": lambda args: "",
+            "boardsize": self._cmd_boardsize,
+            "clear_board": lambda args: self._reset(self._size),
+            "komi": self._cmd_komi,
+            "play": self._cmd_play,
+            "genmove": self._cmd_genmove,
+            "undo": self._cmd_undo,
+            "showboard": lambda args: self._showboard(),
+            "final_score": lambda args: self._final_score(),
+            "time_settings": self._cmd_time_settings,
+            "time_left": self._cmd_time_left,
+        }
+
+    def _reset(self, size: int) -> str:
+        self._size = size
+        self._logic = game_logic(size)
+        self._board = np.zeros((size, size))
+        self._history: list[tuple[np.ndarray, dict[int, int]]] = []
+        self._captures = {1: 0, 2: 0}
+        return ""
+
+    @property
+    def board(self) -> np.ndarray:
+        return self._board
+
+    def _cmd_boardsize(self, args: list[str]) -> str:
+        try:
+            size = int(args[0])
+        except (IndexError, ValueError):
+            raise GtpError("boardsize not an integer")
+        if not 2 <= size <= GTP_MAX_SIZE:
+            raise GtpError("unacceptable size")
+        return self._reset(size)
+
+    def _cmd_komi(self, args: list[str]) -> str:
+        try:
+            self._komi = float(args[0])
+        except (IndexError, ValueError):
+            raise GtpError("komi not a float")
+        return ""
+
+    def play(self, color_code: int, move: tuple[int, int] | None) -> None:
+        self._history.append((self._board.copy(), dict(self._captures)))
+        if move is None:
+            return
+        col, row = move
+        if not self._logic.is_valid_move(col, row, self._board):
+            self._history.pop()
+            raise GtpError("illegal move")
+        self._board[col, row] = color_code
+        captured = self._logic.resolve_captures(self._board, col, row)
+        if self._board[col, row] == 0:
+            # Самоубийство: resolve_captures снял поставленный камень
+            self._board, self._captures = self._history.pop()
+            raise GtpError("illegal move")
+        self._captures[color_code] += captured
+
+    def _cmd_play(self, args: list[str]) -> str:
+        if len(args) < 2:
+            raise GtpError("invalid color or coordinate")
+        self.play(parse_color(args[0]), parse_vertex(args[1], self._size))
+        return ""
+
+    def _cmd_genmove(self, args: list[str]) -> str:
+        if not args:
+            raise GtpError("invalid color")
+        color_code = parse_color(args[0])
+        player = self._players.get(self._size)
+        if player is None:
+            player = self._players[self._size] = ComputerPlayer(self._size, rng=self._rng)
+        move = player.best_move(self._board, color_code, self._time_budget(color_code))
+        try:
+            self.play(color_code, move)
+        except GtpError:
+            move = None  # эвристика предложила самоубийство — пасуем
+            self.play(color_code, move)
+        return format_vertex(move, self._size)
+
+    def _cmd_undo(self, args: list[str]) -> str:
+        if not self._history:
+            raise GtpError("cannot undo")
+        self._board, self._captures = self._history.pop()
+        return ""
+
+    def _cmd_time_settings(self, args: list[str]) -> str:
+        try:
+            self._time_settings = (float(args[0]), float(args[1]), int(args[2]))
+        except (IndexError, ValueError):
+            raise GtpError("syntax error")
+        self._time_left.clear()
+        return ""
+
+    def _cmd_time_left(self, args: list[str]) -> str:
+        try:
+            self._time_left[parse_color(args[0])] = (float(args[1]), int(args[2]))
+        except (IndexError, ValueError):
+            raise GtpError("syntax error")
+        return ""
+
+    def _time_budget(self, color_code: int) -> float | None:
+        """
+        Время на ход по time_settings и последнему time_left, через те же часы, что и в игре.
+        Канадское бёё-ёми (время на несколько камней) считается одним периодом на камень.
+        None — без ограничения.
+        """
+        if self._time_settings is None:
+            return None
+        main_time, byo_yomi_time, byo_yomi_stones = self._time_settings
+        if byo_yomi_time > 0 and byo_yomi_stones == 0:
+            return None  # по GTP это означает игру без контроля времени
+        if byo_yomi_stones:
+            control = TimeControl(TimeControlKind.BYOYOMI, main_time, periods=1,
+                                  period_time_s=byo_yomi_time / byo_yomi_stones)
+        else:
+            control = TimeControl(TimeControlKind.ABSOLUTE, main_time)
+        clock = GameClock(control)
+        color = Colors.BLACK if color_code == 2 else Colors.WHITE
+        if color_code in self._time_left:
+            time_left, stones_left = self._time_left[color_code]
+            if stones_left:
+                clock.set_remaining(color, 0, 1, int(time_left / stones_left * NS_PER_S))
+            else:
+                clock.set_remaining(color, int(time_left * NS_PER_S), control.periods,
+                                    int(control.period_time_s * NS_PER_S))
+        return allocate_move_time(clock, color, self._size, len(self._history))
+
+    def area_score(self) -> float:
+        return area_score(self._board, self._komi)
+
+    def _final_score(self) -> str:
+        score = self.area_score()
+        if score == 0:
+            return "0"
+        return f"{'B' if score > 0 else 'W'}+{abs(score):g}"
+
+    def _showboard(self) -> str:
+        lines = [""]
+        for number in range(self._size, 0, -1):
+            row = self._size - number
+            cells = " ".join(".OX"[int(self._board[col, row])] for col in range(self._size))
+            lines.append(f"{number:2d} {cells}")
+        lines.append("   " + " ".join(GTP_COLUMNS[:self._size]))
+        return "\n".join(lines)
+
+    def handle(self, line: str) -> tuple[str, bool]:
+        """
+        Выполняет одну строку GTP. Возвращает ответ (с пустой строкой в конце) и признак quit.
+        """
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            return "", False
+        parts = line.split()
+        command_id = ""
+        if parts[0].isdigit():
+            command_id = parts.pop(0)
+        if not parts:
+            return "", False
+        command, args = parts[0].lower(), parts[1:]
+        handler = self._commands.get(command)
+        try:
+            if handler is None:
+                raise GtpError("unknown command")
+            return f"={command_id} {handler(args)}".rstrip(" ") + "\n\n", command == "quit"
+        except GtpError as error:
+            return f"?{command_id} {error}\n\n", False
+        except Exception:
+            # Ошибка в движке не должна обрывать сессию: клиент получает отказ, подробности — в stderr
+            traceback.print_exc()
+            return f"?{command_id} internal error\n\n", False
+
+
+def serve_stdio(engine: GtpEngine) -> None:
+    for line in sys.stdin:
+        response, finished = engine.handle(line)
+        if response:
+            sys.stdout.write(response)
+            sys.stdout.flush()
+        if finished:
+            break
+
+
+def _serve_connection(engine: GtpEngine, conn: socket.socket) -> bool:
+    """Обслуживает одно соединение; True, если клиент прислал quit."""
+    with conn, conn.makefile("r", encoding="utf-8") as reader:
+        for line in reader:
+            response, finished = engine.handle(line)
+            if response:
+                conn.sendall(response.encode())
+            if finished:
+                return True
+    return False
+
+
+def serve_tcp(engine: GtpEngine, port: int) -> None:
+    """Принимает по одному клиенту на локальном порту; каждая сессия работает с той же партией."""
+    with socket.create_server(("127.0.0.1", port)) as server:
+        print(f"GTP на 127.0.0.1:{port}", file=sys.stderr)
+        while True:
+            conn, _ = server.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if _serve_connection(engine, conn):
+                return
+
+
+def benchmark(rounds: int) -> None:
+    """
+    Задержка команд без поиска: вызов обработчика в процессе и полный круг через сокет.
+    """
+    commands = ["protocol_version", "boardsize 19", "play b D4", "play w Q16", "undo", "undo", "final_score"]
+    engine = GtpEngine(19)
+    client, server_side = socket.socketpair()
+    worker = threading.Thread(target=_serve_connection, args=(GtpEngine(19), server_side), daemon=True)
+    worker.start()
+    reader = client.makefile("r", encoding="utf-8")
+
+    direct: dict[str, list[float]] = {command: [] for command in commands}
+    round_trip: dict[str, list[float]] = {command: [] for command in commands}
+    for _ in range(rounds):
+        for command in commands:
+            started = time.perf_counter_ns()
+            engine.handle(command)
+            direct[command].append((time.perf_counter_ns() - started) / 1000)
+
+            started = time.perf_counter_ns()
+            client.sendall(f"{command}\n".encode())
+            while reader.readline().strip():
+                pass
+            round_trip[command].append((time.perf_counter_ns() - started) / 1000)
+    client.sendall(b"quit\n")
+    reader.close()
+    client.close()
+
+    def percentile(values: list[float], fraction: float) -> float:
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * fraction))]
+
+    print(f"{'команда':18s} {'обработчик, мкс':>18s} {'через сокет, мкс':>26s}")
+    for command in dict.fromkeys(commands):
+        print(f"{command:18s} {statistics.median(direct[command]):8.1f} (p99 {percentile(direct[command], 0.99):6.1f})"
+              f"  {statistics.median(round_trip[command]):8.1f} (p99 {percentile(round_trip[command], 0.99):7.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GTP-движок без интерфейса")
+    parser.add_argument("--port", type=int, help="слушать локальный TCP-порт вместо stdin/stdout")
+    parser.add_argument("--bench", type=int, metavar="N", help="замерить задержку команд N раз и выйти")
+    parser.add_argument("--seed", type=int, help="зерно случайности: одинаковые партии дают одинаковые ходы")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+    elif args.port:
+        serve_tcp(GtpEngine(seed=args.seed), args.port)
+    else:
+        serve_stdio(GtpEngine(seed=args.seed))
@@ -0,0 +1,328 @@
+import argparse
+import atexit
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from main_logic import game_logic
+from settings import *
+
+# Операции журнала
+OP_PLACE = 1  # камень color в (col, row) со снятием пленных
+OP_PASS = 2  # ход переходит к сопернику
+OP_UNDO = 3  # клетка (col, row) очищается; color: 1, если запись снята с лога ходов
+OP_REDO = 4  # камень color возвращается в (col, row) без снятия пленных
+OP_TURN = 5  # color: 1 — ход чёрных, 0 — ход белых
+
+_RECORD = struct.Struct("<IBBbb")  # seq, операция, цвет, col, row
+_SNAPSHOT_MAGIC = b"GOSN"
+# Сигнатура, версия, размер, seq, ход чёрных, пленные белых/чёрных, длина режима, длина лога ходов
+_SNAPSHOT_HEADER = struct.Struct("<4sHBI?IIHH")
+# С версии 2 после заголовка: есть ли последний ход, его col, row
+_SNAPSHOT_LAST_MOVE = struct.Struct("<?bb")
+_SNAPSHOT_VERSION = 2
+
+JOURNAL_FILE = "journal.bin"
+SNAPSHOT_FILE = "snapshot.bin"
+
+
+@dataclass
+class GameState:
+    size: int
+    mode: str
+    board: np.ndarray
+    prisoners: dict[str, int] = field(default_factory=lambda: {"white": 0, "black": 0})
+    black_turn: bool = False
+    move_log: list[str] = field(default_factory=list)
+    last_move: tuple[int, int] | None = None
+    seq: int = 0
+    moves: int = 0
+
+
+def _write_snapshot(path: str, state: GameState) -> None:
+    mode = state.mode.encode()
+    move_log = "\n".join(state.move_log).encode()
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, state.size, state.seq, state.black_turn,
+                                         state.prisoners["white"], state.prisoners["black"],
+                                         len(mode), len(move_log)))
+        file.write(_SNAPSHOT_LAST_MOVE.pack(state.last_move is not None, *(state.last_move or (0, 0))))
+        file.write(mode)
+        file.write(move_log)
+        file.write(state.board.astype(np.int8).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def _read_snapshot(path: str) -> GameState | None:
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        return None
+    if len(data) < _SNAPSHOT_HEADER.size:
+        return None
+    magic, version, size, seq, black_turn, white_prisoners, black_prisoners, mode_length, log_length = \
+        _SNAPSHOT_HEADER.unpack_from(data)
+    if magic != _SNAPSHOT_MAGIC or version not in (1, _SNAPSHOT_VERSION):
+        return None
+    offset = _SNAPSHOT_HEADER.size
+    last_move = None
+    if version >= 2:
+        has_last_move, last_col, last_row = _SNAPSHOT_LAST_MOVE.unpack_from(data, offset)
+        last_move = (last_col, last_row) if has_last_move else None
+        offset += _SNAPSHOT_LAST_MOVE.size
+    mode = data[offset:offset + mode_length].decode()
+    offset += mode_length
+    move_log = data[offset:offset + log_length].decode().split("\n") if log_length else []
+    offset += log_length
+    board = np.frombuffer(data, dtype=np.int8, count=size * size, offset=offset).reshape(size, size).astype(float)
+    return GameState(size, mode, board, {"white": white_prisoners, "black": black_prisoners}, black_turn,
+                     move_log, last_move, seq=seq)
+
+
+def peek_saved_game(directory: str = AUTOSAVE_DIR) -> tuple[int, str] | None:
+    """Размер и режим сохранённой партии без чтения журнала (для меню)."""
+    state = _read_snapshot(os.path.join(directory, SNAPSHOT_FILE))
+    if state is None:
+        return None
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+    has_moves = os.path.exists(journal_path) and os.path.getsize(journal_path) >= _RECORD.size
+    if not has_moves and not np.count_nonzero(state.board):
+        return None
+    return state.size, state.mode
+
+
+def _log_entry(color_code: int, col: int, row: int) -> str:
+    return f"{'Белые' if color_code == 1 else 'Чёрные'}: {col + 1},{row + 1}"
+
+
+def recover(directory: str = AUTOSAVE_DIR) -> GameState | None:
+    """
+    Восстанавливает партию: последний снимок плюс записи журнала после него.
+    Обрезанная последняя запись (процесс упал во время записи) отбрасывается.
+    """
+    state = _read_snapshot(os.path.join(directory, SNAPSHOT_FILE))
+    if state is None:
+        return None
+    try:
+        with open(os.path.join(directory, JOURNAL_FILE), "rb") as file:
+            data = file.read()
+    except FileNotFoundError:
+        data = b""
+
+    logic = game_logic(state.size)
+    board = state.board
+    last_log: str | None = None
+    for seq, op, color_code, col, row in _RECORD.iter_unpack(data[:len(data) - len(data) % _RECORD.size]):
+        if seq <= state.seq:
+            continue
+        state.seq = seq
+        if op == OP_PLACE:
+            board[col, row] = color_code
+            captured = logic.resolve_captures(board, col, row)
+            state.prisoners["white" if color_code == 1 else "black"] += captured
+            state.move_log.insert(0, _log_entry(color_code, col, row))
+            del state.move_log[4:]  # как в Game: на экране только последние ходы
+            state.last_move = (col, row)
+            state.moves += 1
+        elif op == OP_PASS:
+            state.black_turn = not state.black_turn
+        elif op == OP_UNDO:
+            board[col, row] = 0
+            if state.move_log:
+                last_log = state.move_log[0]
+                if color_code:
+                    state.move_log.pop(0)
+        elif op == OP_REDO:
+            board[col, row] = color_code
+            state.move_log.insert(0, last_log if last_log is not None else _log_entry(color_code, col, row))
+            del state.move_log[4:]
+        elif op == OP_TURN:
+            state.black_turn = bool(color_code)
+    return state
+
+
+class GameJournal:
+    """
+    Журнал партии только на дозапись. Записи копятся в очереди и сбрасываются на диск фоновым потоком
+    пачками (один fsync на пачку), так что игровой цикл не ждёт диска. Периодический снимок
+    ограничивает длину журнала и время восстановления.
+    """
+
+    def __init__(self, directory: str = AUTOSAVE_DIR) -> None:
+        self._directory = directory
+        self._journal_path = os.path.join(directory, JOURNAL_FILE)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._queue: queue.Queue = queue.Queue()
+        self._seq = 0
+        self._since_snapshot = 0
+        self._thread: threading.Thread | None = None
+        self._file = None
+        self.flushes = 0
+        self.records_written = 0
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def start(self, state: GameState) -> None:
+        """Начинает журнал с базового снимка state (новая партия или восстановленная)."""
+        os.makedirs(self._directory, exist_ok=True)
+        self._seq = state.seq
+        self._since_snapshot = 0
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="game-journal", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        self._queue.put(("snapshot", state))
+
+    def append(self, op: int, color_code: int = 0, col: int = 0, row: int = 0) -> None:
+        self._seq += 1
+        self._since_snapshot += 1
+        self._queue.put(("record", _RECORD.pack(self._seq, op, color_code, col, row)))
+
+    def snapshot_due(self) -> bool:
+        return self._since_snapshot >= JOURNAL_SNAPSHOT_EVERY
+
+    def snapshot(self, state: GameState) -> None:
+        """Снимок текущего состояния; state должен быть копией (его пишет фоновый поток)."""
+        state.seq = self._seq
+        self._since_snapshot = 0
+        self._queue.put(("snapshot", state))
+
+    def _writer(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Групповая фиксация: ждём немного, чтобы собрать пачку записей
+            deadline = time.monotonic() + JOURNAL_FLUSH_INTERVAL
+            while item[0] == "record":
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            records = bytearray()
+            for kind, payload in batch:
+                if kind == "record":
+                    records += payload
+                    continue
+                self._write_records(records)
+                records = bytearray()
+                if kind == "snapshot":
+                    _write_snapshot(self._snapshot_path, payload)
+                    # Всё до снимка в нём уже учтено
+                    if self._file is not None:
+                        self._file.close()
+                    self._file = open(self._journal_path, "wb")
+                elif kind == "close":
+                    if self._file is not None:
+                        self._file.close()
+                        self._file = None
+                    payload.set()
+            self._write_records(records)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_records(self, records: bytearray) -> None:
+        if not records:
+            return
+        if self._file is None:
+            self._file = open(self._journal_path, "ab")
+        self._file.write(records)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.flushes += 1
+        self.records_written += len(records) // _RECORD.size
+
+    def flush(self) -> None:
+        """Ждёт, пока все поставленные записи окажутся на диске."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(("close", done))
+        done.wait(timeout=5)
+
+    def discard(self) -> None:
+        """Удаляет сохранение (партия завершена и продолжать нечего)."""
+        self.flush()
+        for path in (self._journal_path, self._snapshot_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+_journal: GameJournal | None = None
+
+
+def get_journal() -> GameJournal:
+    """Общий журнал процесса: один фоновый поток на все партии."""
+    global _journal
+    if _journal is None:
+        _journal = GameJournal()
+    return _journal
+
+
+def benchmark(moves: int, directory: str, snapshots: bool) -> None:
+    import random
+
+    size = 19
+    logic = game_logic(size)
+    board = np.zeros((size, size))
+    journal = GameJournal(directory)
+    journal.start(GameState(size, GameModes.PVP, board.copy()))
+    journal.flush()
+    rng = random.Random(0)
+    color_code = 1
+    append_ns = 0
+    started = time.perf_counter()
+    for _ in range(moves):
+        empty = list(zip(*np.nonzero(board == 0)))
+        col, row = (int(value) for value in rng.choice(empty))
+        board[col, row] = color_code
+        logic.resolve_captures(board, col, row)
+        before = time.perf_counter_ns()
+        journal.append(OP_PLACE, color_code, col, row)
+        journal.append(OP_TURN, int(color_code == 1))
+        if snapshots and journal.snapshot_due():
+            journal.snapshot(GameState(size, GameModes.PVP, board.copy(), black_turn=color_code == 1))
+        append_ns += time.perf_counter_ns() - before
+        color_code = 3 - color_code
+    journal.flush()
+    written = time.perf_counter() - started
+
+    before = time.perf_counter()
+    state = recover(directory)
+    recovery_ms = (time.perf_counter() - before) * 1000
+    assert state is not None and (state.board == board).all(), "восстановленная доска не совпадает"
+    print(f"Ходов: {moves}, записей: {journal.records_written}, сбросов на диск: {journal.flushes}")
+    print(f"Постановка в журнал: {append_ns / moves / 1000:.1f} мкс на ход (игровой поток)")
+    print(f"Запись всей партии с fsync: {written * 1000:.1f} мс")
+    print(f"Восстановление: {recovery_ms:.2f} мс")
+    journal.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Замер журнала автосохранения")
+    parser.add_argument("--moves", type=int, default=300)
+    parser.add_argument("--no-snapshots", action="store_true", help="восстанавливать весь журнал без снимков")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        benchmark(args.moves, temp_dir, not args.no_snapshots)
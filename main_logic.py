@@ -1,10 +1,9 @@
 import itertools
 
-import networkx as nx
 import numpy as np
 from typing import Iterable
+from geometry import get_geometry
 from point import Point
-from settings import *
 
 
 class game_logic:
@@ -12,26 +11,7 @@ class game_logic:
         self._size = size
 
     def get_grid_points(self, size: int) -> tuple[list[Point], list[Point]]:
-        end_points: list[Point] = []
-        start_points: list[Point] = []
-        start_coords, end_coords = [], []
-        xs = np.linspace(BOARD_BORDER, BOARD_WIDTH - BOARD_BORDER, size)
-        ys = np.full(size, BOARD_BORDER)
-        start_coords.extend(zip(xs, ys))
-        xs = np.full(size, BOARD_BORDER)
-        ys = np.linspace(BOARD_BORDER, BOARD_WIDTH - BOARD_BORDER, size)
-        start_coords.extend(zip(xs, ys))
-        xs = np.linspace(BOARD_BORDER, BOARD_WIDTH - BOARD_BORDER, size)
-        ys = np.full(size, BOARD_WIDTH - BOARD_BORDER)
-        end_coords.extend(zip(xs, ys))
-        xs = np.full(size, BOARD_WIDTH - BOARD_BORDER)
-        ys = np.linspace(BOARD_BORDER, BOARD_WIDTH - BOARD_BORDER, size)
-        end_coords.extend(list(zip(xs, ys)))
-        for x, y in end_coords:
-            end_points.append(Point(x, y))
-        for x, y in start_coords:
-            start_points.append(Point(x, y))
-        return start_points, end_points
+        return get_geometry(size).grid_lines
 
     def stone_group_has_no_liberties(self, board: np.ndarray,
                                      group: set[Point]) -> bool:
@@ -50,6 +30,8 @@ class game_logic:
 
     def get_stone_groups(self, board: np.ndarray, color: str) -> Iterable[
         set[Point]]:
+        import networkx as nx  # тяжёлый модуль, загружается при первом обращении
+
         size = board.shape[0]
         color_code = 1 if color == "white" else 2
         xs, ys = np.where(board == color_code)  # Получаем координаты камней
@@ -86,13 +68,20 @@ class game_logic:
 
         return result_points
 
+    def get_liberties(self, board: np.ndarray, group: set[Point]) -> set[Point]:
+        return {neighbor for neighbor in self._get_adjacent_positions(group, self._size)
+                if board[neighbor.x, neighbor.y] == 0}
+
     def count_liberties(self, board: np.ndarray, group: set[Point]) -> int:
-        liberties = set()
-        for point in group:
-            for neighbor in self._get_adjacent_positions(group, self._size):
-                if board[neighbor.x, neighbor.y] == 0:
-                    liberties.add(neighbor)
-        return len(liberties)
+        return len(self.get_liberties(board, group))
+
+    def get_adjacent_groups(self, board: np.ndarray, group: set[Point], color_code: int) -> list[set[Point]]:
+        """Группы цвета color_code, соседние с group."""
+        groups: list[set[Point]] = []
+        for neighbor in self._get_adjacent_positions(group, self._size):
+            if board[neighbor.x, neighbor.y] == color_code and not any(neighbor in other for other in groups):
+                groups.append(self.get_group(board, neighbor))
+        return groups
 
     def _get_adjacent_positions(self, positions: set[Point], size: int) -> set[Point]:
 
@@ -111,6 +100,29 @@ class game_logic:
         adjacent.difference_update(positions)
         return adjacent
 
+    def resolve_captures(self, board: np.ndarray, col: int, row: int) -> int:
+        """
+        Снимает группы соперника без дыханий после камня в (col, row) и возвращает число снятых камней.
+        Если ничего не снято, а у собственной группы нет дыханий, камень убирается (самоубийство запрещено).
+        """
+        self_code = int(board[col, row])
+        stone = {Point(col, row)}
+        captured = 0
+
+        # Проверка, не захвачены ли камни противника: только группы рядом с новым камнем
+        for group in self.get_adjacent_groups(board, stone, 3 - self_code):
+            if self.stone_group_has_no_liberties(board, group):
+                for point in group:
+                    board[point.x, point.y] = 0
+                captured += len(group)
+
+        if not captured:
+            # Проверка, захватил ли недавно установленный камень свою собственную группу
+            group = self.get_group(board, Point(col, row))
+            if self.stone_group_has_no_liberties(board, group):
+                board[col, row] = 0
+        return captured
+
     def is_valid_move(self, col: int, row: int, board: np.ndarray) -> bool:
         if col < 0 or col >= board.shape[0]:
             return False
@@ -122,18 +134,11 @@ class game_logic:
         """
         Преобразует координаты точки (x, y) в индексы столбца и строки (col, row).
         """
-        inc = (BOARD_WIDTH - 2 * BOARD_BORDER) / (self._size - 1)
-        x_dist = point.x - BOARD_BORDER
-        y_dist = point.y - BOARD_BORDER
-        col = round(x_dist / inc)
-        row = round(y_dist / inc)
-        return col, row
+        return get_geometry(self._size).screen_to_colrow(point.x, point.y)
 
     def colrow_to_point(self, col: int, row: int) -> 'Point':
         """
         Преобразует индексы столбца и строки (col, row) в координаты точки (x, y).
         """
-        inc = (BOARD_WIDTH - 2 * BOARD_BORDER) / (self._size - 1)
-        x = int(BOARD_BORDER + col * inc)
-        y = int(BOARD_BORDER + row * inc)
+        x, y = get_geometry(self._size).colrow_to_screen(col, row)
         return Point(x=x, y=y)
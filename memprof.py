@@ -0,0 +1,180 @@
+import atexit
+import functools
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from settings import *
+
+ENV_VAR = "GO_MEMPROF"  # "1" — отчёт в MEMPROF_REPORT_PATH, иначе путь к отчёту
+
+# Операции, которые можно замерить: имя -> (модуль, класс, метод)
+TARGETS = {
+    "captures": ("game", "Game", "_handle_captures"),
+    "ai.best_move": ("ai", "ComputerPlayer", "best_move"),
+    "ai.random_move": ("ai", "ComputerPlayer", "random_move"),
+    "render.draw": ("renderer", "Renderer", "draw"),
+}
+
+
+@dataclass
+class _OperationStats:
+    calls: int = 0
+    time_ns: int = 0
+    net_bytes: int = 0
+    peak_bytes_total: int = 0
+    peak_bytes_max: int = 0
+    gc_collections: int = 0
+    gc_pause_ns: int = 0
+    gc_pause_max_ns: int = 0
+    sites: dict[str, list[int]] = field(default_factory=dict)  # "файл:строка" -> [байт, блоков]
+    sampled: int = 0
+
+
+class MemoryProfiler:
+    """
+    Замер памяти по операциям: tracemalloc (прирост и пик памяти за вызов) и gc.callbacks (паузы сборщика).
+    Места выделения берутся из разницы снимков tracemalloc для каждого snapshot_every-го вызова:
+    снимок дорогой, поэтому на каждом вызове его не делаем.
+    """
+
+    def __init__(self, report_path: str = MEMPROF_REPORT_PATH, snapshot_every: int = MEMPROF_SNAPSHOT_EVERY,
+                 top: int = MEMPROF_TOP_SITES) -> None:
+        self._report_path = report_path
+        self._snapshot_every = snapshot_every
+        self._top = top
+        self._operations: dict[str, _OperationStats] = {}
+        self._other = _OperationStats()  # сборки мусора вне замеряемых операций
+        self._active: _OperationStats | None = None
+        self._gc_started_ns = 0
+        self._peak_bytes = 0
+        self._started_ns = 0
+
+    def start(self) -> None:
+        tracemalloc.start()
+        gc.callbacks.append(self._gc_callback)
+        self._started_ns = time.perf_counter_ns()
+        atexit.register(self.write_report)
+
+    def _gc_callback(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_started_ns = time.perf_counter_ns()
+            return
+        pause_ns = time.perf_counter_ns() - self._gc_started_ns
+        stats = self._active if self._active is not None else self._other
+        stats.gc_collections += 1
+        stats.gc_pause_ns += pause_ns
+        stats.gc_pause_max_ns = max(stats.gc_pause_max_ns, pause_ns)
+
+    def wrap(self, name: str, method):
+        @functools.wraps(method)
+        def measured(*args, **kwargs):
+            if self._active is not None:
+                # Вложенная операция (например, random_move внутри best_move) учитывается во внешней
+                return method(*args, **kwargs)
+            stats = self._operations.setdefault(name, _OperationStats())
+            sample = stats.calls % self._snapshot_every == 0
+            before_snapshot = tracemalloc.take_snapshot() if sample else None
+            current_before, peak = tracemalloc.get_traced_memory()
+            self._peak_bytes = max(self._peak_bytes, peak)
+            tracemalloc.reset_peak()
+            self._active = stats
+            started = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats.time_ns += time.perf_counter_ns() - started
+                self._active = None
+                current_after, peak = tracemalloc.get_traced_memory()
+                self._peak_bytes = max(self._peak_bytes, peak)
+                stats.calls += 1
+                stats.net_bytes += current_after - current_before
+                stats.peak_bytes_total += peak - current_before
+                stats.peak_bytes_max = max(stats.peak_bytes_max, peak - current_before)
+                if before_snapshot is not None:
+                    self._add_sites(stats, before_snapshot)
+
+        return measured
+
+    def _add_sites(self, stats: _OperationStats, before: tracemalloc.Snapshot) -> None:
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        stats.sampled += 1
+        for difference in after.compare_to(before.filter_traces(filters), "lineno"):
+            if difference.size_diff <= 0:
+                continue
+            frame = difference.traceback[0]
+            site = stats.sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            site[0] += difference.size_diff
+            site[1] += difference.count_diff
+
+    def report(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+
+        def summary(stats: _OperationStats) -> dict:
+            calls = max(stats.calls, 1)
+            sites = sorted(stats.sites.items(), key=lambda item: item[1][0], reverse=True)[:self._top]
+            return {
+                "calls": stats.calls,
+                "time_ms_mean": round(stats.time_ns / calls / 1e6, 3),
+                "net_bytes_total": stats.net_bytes,
+                "net_bytes_mean": round(stats.net_bytes / calls),
+                "peak_bytes_mean": round(stats.peak_bytes_total / calls),
+                "peak_bytes_max": stats.peak_bytes_max,
+                "gc_collections": stats.gc_collections,
+                "gc_pause_ms_total": round(stats.gc_pause_ns / 1e6, 3),
+                "gc_pause_ms_max": round(stats.gc_pause_max_ns / 1e6, 3),
+                # Прирост памяти по местам выделения в среднем на замеренный снимками вызов
+                "top_sites": [{"site": site, "bytes": size // max(stats.sampled, 1),
+                               "blocks": count // max(stats.sampled, 1)} for site, (size, count) in sites],
+            }
+
+        return {
+            "python": platform.python_version(),
+            "duration_s": round((time.perf_counter_ns() - self._started_ns) / 1e9, 3),
+            "traced_current_bytes": current,
+            "traced_peak_bytes": max(self._peak_bytes, peak),
+            "gc_counts": gc.get_count(),
+            "gc_stats": gc.get_stats(),
+            "operations": {name: summary(stats) for name, stats in sorted(self._operations.items())},
+            "outside_operations": {key: value for key, value in summary(self._other).items()
+                                   if key.startswith("gc_")},
+        }
+
+    def write_report(self) -> None:
+        with open(self._report_path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, ensure_ascii=False, indent=2)
+        print(f"Отчёт о памяти: {self._report_path}")
+
+
+_profiler: MemoryProfiler | None = None
+
+
+def install(report_path: str = MEMPROF_REPORT_PATH, targets: tuple[str, ...] = tuple(TARGETS)) -> MemoryProfiler:
+    """
+    Включает замер: оборачивает методы targets и пишет JSON-отчёт при выходе. Без вызова install
+    игра работает без всяких накладных расходов.
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    import importlib
+
+    _profiler = MemoryProfiler(report_path)
+    for name in targets:
+        module_name, class_name, method_name = TARGETS[name]
+        cls = getattr(importlib.import_module(module_name), class_name)
+        setattr(cls, method_name, _profiler.wrap(name, getattr(cls, method_name)))
+    _profiler.start()
+    return _profiler
+
+
+def install_from_env(targets: tuple[str, ...] = tuple(TARGETS)) -> MemoryProfiler | None:
+    value = os.environ.get(ENV_VAR)
+    if not value or value == "0":
+        return None
+    return install(MEMPROF_REPORT_PATH if value == "1" else value, targets)
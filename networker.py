@@ -1,13 +1,38 @@
 # network_manager.py
 
+import collections
+import dataclasses
+import re
 import socket
 import pygame
 import sys
 import select
+import time
 import traceback
 from settings import *
 from point import Point
 
+# Ход в старом формате: "col,row" без префикса и без перевода строки
+_LEGACY_MOVE = re.compile(r"\d+,\d+")
+
+
+@dataclasses.dataclass
+class NetworkStats:
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    messages_sent: int = 0
+    messages_received: int = 0
+    pings_sent: int = 0
+    pongs_received: int = 0
+    rtt_ms: float | None = None
+    rtt_avg_ms: float | None = None
+    rtt_min_ms: float | None = None
+    clock_offset_ms: float | None = None  # часы соперника минус наши
+    poll_interval_ms: float | None = None  # период опроса сети игровым циклом
+    last_receive_age_s: float = 0.0
+    connected: bool = True
+    stalled: bool = False
+
 
 class NetworkManager:
     def __init__(self, mode: str, font: pygame.font.Font, screen: pygame.Surface):
@@ -22,6 +47,23 @@ class NetworkManager:
         self._server_socket: None | socket.socket = None
         self._black_turn = True  # Черные ходят первыми
 
+        self._stats = NetworkStats()
+        self._recv_buffer = b""
+        self._pending_moves: collections.deque[tuple[Point, tuple[int, int, int] | None]] = collections.deque()
+        # Часы соперника из последнего полученного хода: основное время, периоды, остаток периода (нс)
+        self.last_move_clock: tuple[int, int, int] | None = None
+        self._ping_seq = 0
+        self._last_ping_time = 0.0
+        self._last_poll_time: float | None = None
+        self._last_receive_time: float | None = None
+        # Протокол соперника выясняется по его сообщениям. Старая версия разбирает только "col,row"
+        # (лишние пробелы и перевод строки она отбрасывает) и падает на всём остальном, а сама шлёт
+        # ход без перевода строки. Поэтому, пока соперник не прислал сообщение с переводом строки,
+        # ходы уходят как "col,row\n", а пульса нет: старая версия их разберёт, а новая по переводу
+        # строки узнаёт нас и переходит на полный формат с пульсом и часами.
+        self._peer_framed = False
+        self._legacy_peer = False
+
     def setup_network(self):
         choice_made = False
 
@@ -158,22 +200,138 @@ class NetworkManager:
             pygame.draw.rect(self._screen, color, input_rect, 2)
             pygame.display.flip()
 
-    def send_move(self, move_str: str) -> None:
-        if self._conn:
-            self._conn.send(move_str.encode())
+    def _send(self, message: str, framed: bool = True) -> None:
+        if not self._stats.connected:
+            return
+        data = (message + "\n" if framed else message).encode()
+        try:
+            self._conn.sendall(data)
+        except OSError:
+            # Разрыв показывается в статистике соединения, партия не завершается
+            self._stats.connected = False
+            return
+        self._stats.bytes_sent += len(data)
+        self._stats.messages_sent += 1
 
-    def receive_move(self) -> Point | None:
+    def send_move(self, move_str: str, clock: tuple[int, int, int] | None = None) -> None:
+        """
+        Ход "col,row"; clock — оставшееся время ходившего после хода (основное, периоды, период в нс),
+        по нему соперник выставляет наши часы у себя.
+        """
         if self._conn:
-            try:
+            if not self._peer_framed:
+                # Старой версии — ровно в её формате; неизвестному сопернику — с переводом строки
+                self._send(move_str, framed=not self._legacy_peer)
+                return
+            if clock is not None:
+                move_str += " " + ",".join(str(value) for value in clock)
+            self._send(f"M {move_str}")
+
+    def _send_ping(self, now: float) -> None:
+        self._ping_seq += 1
+        self._last_ping_time = now
+        self._stats.pings_sent += 1
+        self._send(f"PING {self._ping_seq} {time.perf_counter_ns()} {time.time_ns()}")
+
+    def _handle_message(self, message: str) -> None:
+        kind, _, payload = message.partition(" ")
+        if kind == "PING":
+            self._send(f"PONG {payload} {time.time_ns()}")
+        elif kind == "PONG":
+            self._handle_pong(payload)
+        elif kind == "M":
+            move, _, clock = payload.partition(" ")
+            col, row = move.split(',')
+            move_clock = tuple(int(value) for value in clock.split(',')) if clock else None
+            self._pending_moves.append((Point(int(col), int(row)), move_clock))
+        elif _LEGACY_MOVE.fullmatch(message):
+            col, row = message.split(',')
+            self._pending_moves.append((Point(int(col), int(row)), None))
+
+    def _handle_pong(self, payload: str) -> None:
+        _, sent_perf_ns, sent_wall_ns, peer_wall_ns = (int(value) for value in payload.split())
+        rtt_ns = time.perf_counter_ns() - sent_perf_ns
+        stats = self._stats
+        stats.pongs_received += 1
+        stats.rtt_ms = rtt_ns / 1e6
+        stats.rtt_avg_ms = stats.rtt_ms if stats.rtt_avg_ms is None else \
+            stats.rtt_avg_ms + (stats.rtt_ms - stats.rtt_avg_ms) * RTT_SMOOTHING
+        # Смещение часов соперника (как в NTP); берём замер с наименьшей задержкой — он точнее
+        if stats.rtt_min_ms is None or stats.rtt_ms <= stats.rtt_min_ms:
+            stats.rtt_min_ms = stats.rtt_ms
+            stats.clock_offset_ms = (peer_wall_ns - (sent_wall_ns + rtt_ns // 2)) / 1e6
+
+    def poll(self) -> None:
+        """
+        Неблокирующая обработка сети за один кадр: пульс, чтение всех доступных данных, проверка зависания.
+        """
+        if not self._conn:
+            return
+        now = time.perf_counter()
+        if self._last_poll_time is not None:
+            interval_ms = (now - self._last_poll_time) * 1000
+            self._stats.poll_interval_ms = interval_ms if self._stats.poll_interval_ms is None else \
+                self._stats.poll_interval_ms + (interval_ms - self._stats.poll_interval_ms) * RTT_SMOOTHING
+        self._last_poll_time = now
+        if self._last_receive_time is None:
+            self._last_receive_time = now
+
+        if self._stats.connected:
+            if self._peer_framed and now - self._last_ping_time >= HEARTBEAT_INTERVAL:
+                self._send_ping(now)
+            self._read(now)
+
+        self._stats.last_receive_age_s = now - self._last_receive_time
+        # Пульс идёт только с соперником нового формата: тишина от остальных — не зависание
+        self._stats.stalled = not self._stats.connected or \
+            (self._peer_framed and self._stats.last_receive_age_s > NETWORK_STALL_TIMEOUT)
+
+    def _read(self, now: float) -> None:
+        """Читает всё доступное без блокировки; ошибка сокета или EOF помечают соединение разорванным."""
+        try:
+            while self._stats.connected:
                 ready_to_read, _, _ = select.select([self._conn], [], [], 0)
-                if self._conn in ready_to_read:
-                    data = self._conn.recv(1024)
-                    if data:
-                        move = data.decode().strip()
-                        col, row = move.split(',')
-                        return Point(int(col), int(row))
-            except Exception:
-                traceback.print_exc()
-                pygame.quit()
-                sys.exit()
+                if self._conn not in ready_to_read:
+                    break
+                data = self._conn.recv(4096)
+                if not data:
+                    self._stats.connected = False
+                    break
+                self._last_receive_time = now
+                self._stats.bytes_received += len(data)
+                self._recv_buffer += data
+                *messages, self._recv_buffer = self._recv_buffer.split(b"\n")
+                for message in messages:
+                    self._peer_framed = True  # перевод строки шлёт только новая версия
+                    self._dispatch(message)
+        except OSError:
+            traceback.print_exc()
+            self._stats.connected = False
+            return
+        # Старая версия шлёт ход без перевода строки: забираем его, когда данные перестали приходить
+        if self._recv_buffer and not self._peer_framed and now - self._last_receive_time >= LEGACY_MESSAGE_TIMEOUT:
+            if _LEGACY_MOVE.fullmatch(self._recv_buffer.decode(errors="replace").strip()):
+                self._legacy_peer = True
+                message, self._recv_buffer = self._recv_buffer, b""
+                self._dispatch(message)
+
+    def _dispatch(self, data: bytes) -> None:
+        message = data.decode(errors="replace").strip()
+        if not message:
+            return
+        self._stats.messages_received += 1
+        try:
+            self._handle_message(message)
+        except ValueError:
+            traceback.print_exc()  # испорченное сообщение пропускаем, соединение живо
+
+    def get_stats(self) -> NetworkStats:
+        """Копия счётчиков соединения."""
+        return dataclasses.replace(self._stats)
+
+    def receive_move(self) -> Point | None:
+        self.poll()
+        if self._pending_moves:
+            move, self.last_move_clock = self._pending_moves.popleft()
+            return move
         return None
@@ -0,0 +1,232 @@
+import argparse
+import functools
+import mmap
+import os
+import random
+import struct
+
+import numpy as np
+
+from settings import *
+from zobrist import position_hash
+
+_BOOK_MAGIC = b"GOBK"
+_BOOK_VERSION = 2
+# Заголовок: сигнатура, версия, максимальное число камней в позициях книги, число записей
+_BOOK_HEADER = struct.Struct("<4sHHQ")
+# Запись: хэш канонической позиции, ход (col * size + row в канонической ориентации), размер доски, вес.
+# Записи отсортированы по (хэш, размер, ход): книги разных размеров не смешиваются даже при совпадении хэша
+_BOOK_RECORD = struct.Struct("<QHHf")
+_BOOK_HASH = struct.Struct("<Q")
+
+
+@functools.cache
+def _symmetries(size: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Для каждой из 8 симметрий доски: (индексы исходных клеток для преобразованной доски,
+    обратная таблица: исходная клетка -> клетка после преобразования).
+    """
+    indices = np.arange(size * size).reshape(size, size)
+    result = []
+    for flip in (False, True):
+        base = indices.T if flip else indices
+        for turns in range(4):
+            forward = np.ascontiguousarray(np.rot90(base, turns)).ravel()
+            inverse = np.empty_like(forward)
+            inverse[forward] = np.arange(size * size)
+            result.append((forward, inverse))
+    return result
+
+
+def canonical_position(board: np.ndarray, black_to_move: bool) -> tuple[int, np.ndarray, np.ndarray]:
+    """
+    Каноническая форма позиции: минимальный хэш среди 8 симметрий и таблицы перевода ходов.
+    """
+    size = board.shape[0]
+    flat = board.ravel()
+    best = None
+    for forward, inverse in _symmetries(size):
+        value = position_hash(flat[forward].reshape(size, size), black_to_move)
+        if best is None or value < best[0]:
+            best = (value, forward, inverse)
+    return best
+
+
+class OpeningBook:
+    """
+    Дебютная книга: отсортированный файл записей фиксированной длины, чтение через mmap и бинарный поиск.
+    Файл открывается при первом обращении, в память ничего не загружается.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._mmap: mmap.mmap | None = None
+        self._count = 0
+        self._max_stones = 0
+        self._opened = False
+
+    def _open(self) -> None:
+        self._opened = True
+        if not os.path.exists(self._path) or os.path.getsize(self._path) < _BOOK_HEADER.size:
+            return
+        with open(self._path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._max_stones, self._count = _BOOK_HEADER.unpack_from(self._mmap)
+        if magic != _BOOK_MAGIC or version != _BOOK_VERSION:
+            raise ValueError(f"{self._path}: неизвестный формат дебютной книги")
+
+    def __len__(self) -> int:
+        if not self._opened:
+            self._open()
+        return self._count
+
+    def _hash_at(self, index: int) -> int:
+        return _BOOK_HASH.unpack_from(self._mmap, _BOOK_HEADER.size + index * _BOOK_RECORD.size)[0]
+
+    def _entries(self, key: int, size: int) -> list[tuple[int, float]]:
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._hash_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        entries = []
+        while low < self._count:
+            value, move, book_size, weight = _BOOK_RECORD.unpack_from(self._mmap,
+                                                                      _BOOK_HEADER.size + low * _BOOK_RECORD.size)
+            if value != key:
+                break
+            # Ход другого размера или за пределами доски не подходит к этой позиции
+            if book_size == size and move < size * size:
+                entries.append((move, weight))
+            low += 1
+        return entries
+
+    def lookup(self, board: np.ndarray, black_to_move: bool) -> tuple[int, int] | None:
+        """Ход из книги с наибольшим весом или None, если позиции в книге нет."""
+        if not self._opened:
+            self._open()
+        if self._mmap is None or np.count_nonzero(board) > self._max_stones:
+            return None
+        key, forward, _ = canonical_position(board, black_to_move)
+        entries = self._entries(key, board.shape[0])
+        if not entries:
+            return None
+        move, _ = max(entries, key=lambda entry: entry[1])
+        original = int(forward[move])
+        return divmod(original, board.shape[0])
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._opened = False
+
+
+_opening_book: OpeningBook | None = None
+
+
+def get_opening_book() -> OpeningBook:
+    global _opening_book
+    if _opening_book is None:
+        _opening_book = OpeningBook(OPENING_BOOK_PATH)
+    return _opening_book
+
+
+class BookBuilder:
+    """Накопитель статистики (позиция, ход) для записи книги."""
+
+    def __init__(self, max_stones: int) -> None:
+        self._max_stones = max_stones
+        self._counts: dict[tuple[int, int, int], int] = {}  # (хэш, размер, ход) -> число партий
+
+    def add(self, board: np.ndarray, black_to_move: bool, col: int, row: int) -> None:
+        size = board.shape[0]
+        if np.count_nonzero(board) > self._max_stones or not (0 <= col < size and 0 <= row < size):
+            return
+        key, _, inverse = canonical_position(board, black_to_move)
+        move = int(inverse[col * size + row])
+        self._counts[(key, size, move)] = self._counts.get((key, size, move), 0) + 1
+
+    def add_game(self, size: int, moves: list[tuple[int, tuple[int, int] | None]]) -> None:
+        from main_logic import game_logic
+
+        logic = game_logic(size)
+        board = np.zeros((size, size))
+        for color_code, move in moves:
+            if np.count_nonzero(board) > self._max_stones:
+                break
+            if move is None:
+                continue
+            col, row = move
+            if not logic.is_valid_move(col, row, board):
+                break
+            self.add(board, color_code == 2, col, row)
+            board[col, row] = color_code
+            logic.resolve_captures(board, col, row)
+
+    def write(self, path: str) -> int:
+        totals: dict[tuple[int, int], int] = {}
+        for (key, size, _), count in self._counts.items():
+            totals[(key, size)] = totals.get((key, size), 0) + count
+        records = sorted((key, size, move, count / totals[(key, size)])
+                         for (key, size, move), count in self._counts.items())
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_BOOK_HEADER.pack(_BOOK_MAGIC, _BOOK_VERSION, self._max_stones, len(records)))
+            for key, size, move, weight in records:
+                file.write(_BOOK_RECORD.pack(key, move, size, weight))
+        os.replace(temp_path, path)
+        return len(records)
+
+
+def self_play_openings(size: int, games: int, depth: int, seed: int) -> list[list[tuple[int, tuple[int, int]]]]:
+    """
+    Дебюты самоигры эвристики: с небольшой случайностью среди лучших кандидатов для разнообразия.
+    Как и в игре с компьютером, первыми ходят белые.
+    """
+    from ai import ComputerPlayer
+    from main_logic import game_logic
+
+    rng = random.Random(seed)
+    player = ComputerPlayer(size, use_book=False, rng=rng)
+    logic = game_logic(size)
+    openings = []
+    for _ in range(games):
+        board = np.zeros((size, size))
+        color_code = 1
+        moves = []
+        for _ in range(depth):
+            scored = player.score_moves(board, color_code)
+            if not scored:
+                break
+            _, (col, row) = scored[rng.randrange(min(3, len(scored)))] if rng.random() < 0.3 else scored[0]
+            moves.append((color_code, (col, row)))
+            board[col, row] = color_code
+            logic.resolve_captures(board, col, row)
+            color_code = 3 - color_code
+        openings.append(moves)
+    return openings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Построение дебютной книги")
+    parser.add_argument("--out", default=OPENING_BOOK_PATH)
+    parser.add_argument("--sizes", type=int, nargs="+", default=BOARD_SIZES)
+    parser.add_argument("--games", type=int, default=20, help="партий самоигры на каждый размер")
+    parser.add_argument("--depth", type=int, default=8, help="число ходов в дебюте")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sgf", nargs="*", default=[], help="дополнительно импортировать партии из SGF")
+    args = parser.parse_args()
+
+    builder = BookBuilder(max_stones=args.depth)
+    for board_size in args.sizes:
+        for opening in self_play_openings(board_size, args.games, args.depth, args.seed):
+            builder.add_game(board_size, opening)
+    if args.sgf:
+        from sgf import read_sgf
+        for sgf_path in args.sgf:
+            game = read_sgf(sgf_path)
+            builder.add_game(game.size, game.moves)
+    print(f"Записей в книге: {builder.write(args.out)} -> {args.out}")
@@ -0,0 +1,249 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from main_logic import game_logic
+from settings import *
+
+# Состояния клетки в шаблоне: пусто, белый, чёрный, край доски
+EMPTY, WHITE_STONE, BLACK_STONE, EDGE = 0, 1, 2, 3
+_SWAP_COLORS = np.array([EMPTY, BLACK_STONE, WHITE_STONE, EDGE])
+
+_OFFSETS_3 = [(dx, dy) for dx in range(-1, 2) for dy in range(-1, 2) if (dx, dy) != (0, 0)]
+_OFFSETS_5 = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if (dx, dy) != (0, 0)]
+
+_INDEX_3 = {offset: index for index, offset in enumerate(_OFFSETS_3)}
+
+# Ключи фиксированы, чтобы хэши совпадали с сохранёнными таблицами весов
+_rng = np.random.default_rng(0x605EED)
+_KEYS_3 = _rng.integers(0, np.iinfo(np.uint64).max, size=(len(_OFFSETS_3), 4), dtype=np.uint64, endpoint=True)
+_KEYS_5 = _rng.integers(0, np.iinfo(np.uint64).max, size=(len(_OFFSETS_5), 4), dtype=np.uint64, endpoint=True)
+
+# Вес хода без записи в таблице зависит от линии (0 — первая линия) и наличия камней рядом
+_LINE_WEIGHTS = [0.1, 0.5, 1.0, 0.9]
+_NEARBY_BONUS = 3.0
+
+_WEIGHTS_MAGIC = b"GOPW"
+_WEIGHTS_HEADER = struct.Struct("<4sHII")
+_WEIGHTS_RECORD = np.dtype([("hash", "<u8"), ("weight", "<f4")])
+
+
+class PatternWeights:
+    """
+    Таблица весов шаблонов 3x3 и 5x5 (хэши для хода чёрных).
+    """
+
+    def __init__(self, weights_3: dict[int, float] | None = None, weights_5: dict[int, float] | None = None) -> None:
+        self.weights_3: dict[int, float] = weights_3 or {}
+        self.weights_5: dict[int, float] = weights_5 or {}
+
+    @classmethod
+    def load(cls, path: str) -> 'PatternWeights':
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, count_3, count_5 = _WEIGHTS_HEADER.unpack_from(data)
+        if magic != _WEIGHTS_MAGIC or version != 1:
+            raise ValueError(f"{path}: неизвестный формат таблицы шаблонов")
+        records = np.frombuffer(data, dtype=_WEIGHTS_RECORD, count=count_3 + count_5, offset=_WEIGHTS_HEADER.size)
+        records_3, records_5 = records[:count_3], records[count_3:]
+        return cls(dict(zip(records_3["hash"].tolist(), records_3["weight"].tolist())),
+                   dict(zip(records_5["hash"].tolist(), records_5["weight"].tolist())))
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(_WEIGHTS_HEADER.pack(_WEIGHTS_MAGIC, 1, len(self.weights_3), len(self.weights_5)))
+            for weights in (self.weights_3, self.weights_5):
+                records = np.empty(len(weights), dtype=_WEIGHTS_RECORD)
+                records["hash"] = np.fromiter(weights.keys(), dtype=np.uint64, count=len(weights))
+                records["weight"] = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+                records.sort(order="hash")
+                file.write(records.tobytes())
+
+
+_default_weights: PatternWeights | None = None
+
+
+def get_default_weights() -> PatternWeights:
+    """Таблица из PATTERN_WEIGHTS_PATH, загружается один раз; пустая, если файла нет."""
+    global _default_weights
+    if _default_weights is None:
+        if os.path.exists(PATTERN_WEIGHTS_PATH):
+            _default_weights = PatternWeights.load(PATTERN_WEIGHTS_PATH)
+        else:
+            _default_weights = PatternWeights()
+    return _default_weights
+
+
+class PatternBoard:
+    """
+    Хэши локальных шаблонов 3x3 и 5x5 вокруг каждой клетки, обновляемые инкрементально.
+    """
+
+    def __init__(self, size: int, weights: PatternWeights | None = None) -> None:
+        self._size = size
+        self._weights = weights if weights is not None else get_default_weights()
+        self._board = np.zeros((size, size), dtype=np.int8)
+
+        distance_to_edge = np.minimum(np.arange(size), np.arange(size)[::-1])
+        lines = np.minimum.outer(distance_to_edge, distance_to_edge)
+        self._line_weights = np.array(_LINE_WEIGHTS)[np.minimum(lines, len(_LINE_WEIGHTS) - 1)]
+        self._rebuild()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _rebuild(self) -> None:
+        size = self._size
+        padded = np.full((size + 4, size + 4), EDGE, dtype=np.int8)
+        padded[2:-2, 2:-2] = self._board
+        swapped = _SWAP_COLORS[padded]
+
+        self._hash_3 = np.zeros((size, size), dtype=np.uint64)
+        self._hash_3_swapped = np.zeros((size, size), dtype=np.uint64)
+        self._hash_5 = np.zeros((size, size), dtype=np.uint64)
+        self._hash_5_swapped = np.zeros((size, size), dtype=np.uint64)
+        for hashes, hashes_swapped, offsets, keys in ((self._hash_3, self._hash_3_swapped, _OFFSETS_3, _KEYS_3),
+                                                      (self._hash_5, self._hash_5_swapped, _OFFSETS_5, _KEYS_5)):
+            for index, (dx, dy) in enumerate(offsets):
+                window = (slice(2 + dx, 2 + dx + size), slice(2 + dy, 2 + dy + size))
+                hashes ^= keys[index][padded[window]]
+                hashes_swapped ^= keys[index][swapped[window]]
+
+        stones = np.zeros((size + 4, size + 4), dtype=np.int32)
+        stones[2:-2, 2:-2] = self._board != 0
+        self._nearby = sum(stones[2 + dx:2 + dx + size, 2 + dy:2 + dy + size] for dx, dy in _OFFSETS_5)
+
+    def _update_point(self, col: int, row: int, old: int, new: int) -> None:
+        size = self._size
+        swapped_old, swapped_new = _SWAP_COLORS[old], _SWAP_COLORS[new]
+        nearby_delta = int(new != EMPTY) - int(old != EMPTY)
+        for index, (dx, dy) in enumerate(_OFFSETS_5):
+            # Клетка (col, row) видна из центра (x, y) со смещением (dx, dy)
+            x, y = col - dx, row - dy
+            if not (0 <= x < size and 0 <= y < size):
+                continue
+            self._hash_5[x, y] ^= _KEYS_5[index, old] ^ _KEYS_5[index, new]
+            self._hash_5_swapped[x, y] ^= _KEYS_5[index, swapped_old] ^ _KEYS_5[index, swapped_new]
+            self._nearby[x, y] += nearby_delta
+            if -1 <= dx <= 1 and -1 <= dy <= 1:
+                index_3 = _INDEX_3[(dx, dy)]
+                self._hash_3[x, y] ^= _KEYS_3[index_3, old] ^ _KEYS_3[index_3, new]
+                self._hash_3_swapped[x, y] ^= _KEYS_3[index_3, swapped_old] ^ _KEYS_3[index_3, swapped_new]
+
+    def sync(self, board: np.ndarray) -> None:
+        """
+        Приводит хэши в соответствие с доской: перехэшируются только шаблоны вокруг изменившихся клеток.
+        """
+        cols, rows = np.nonzero(self._board != board)
+        if len(cols) == 0:
+            return
+        if len(cols) > self._size * self._size // 4:
+            self._board[:] = board
+            self._rebuild()
+            return
+        for col, row in zip(cols.tolist(), rows.tolist()):
+            old, new = int(self._board[col, row]), int(board[col, row])
+            self._board[col, row] = new
+            self._update_point(col, row, old, new)
+
+    def _hashes(self, color_code: int) -> tuple[np.ndarray, np.ndarray]:
+        if color_code == 2:
+            return self._hash_3, self._hash_5
+        return self._hash_3_swapped, self._hash_5_swapped
+
+    def pattern_hashes(self, col: int, row: int, color_code: int) -> tuple[int, int]:
+        """Хэши 3x3 и 5x5 вокруг (col, row) с точки зрения игрока color_code."""
+        hash_3, hash_5 = self._hashes(color_code)
+        return int(hash_3[col, row]), int(hash_5[col, row])
+
+    def priors(self, color_code: int) -> np.ndarray:
+        """
+        Априорные вероятности всех допустимых ходов игрока color_code одним массивом (size, size).
+        """
+        hash_3, hash_5 = self._hashes(color_code)
+        weights = self._line_weights * np.where(self._nearby > 0, _NEARBY_BONUS, 1.0)
+        weights[self._board != EMPTY] = 0.0
+
+        weights_3, weights_5 = self._weights.weights_3, self._weights.weights_5
+        if weights_3 or weights_5:
+            cols, rows = np.nonzero(self._board == EMPTY)
+            for col, row, h3, h5 in zip(cols.tolist(), rows.tolist(),
+                                        hash_3[cols, rows].tolist(), hash_5[cols, rows].tolist()):
+                # Более крупный шаблон точнее, поэтому проверяется первым
+                weight = weights_5.get(h5)
+                if weight is None:
+                    weight = weights_3.get(h3)
+                if weight is not None:
+                    weights[col, row] = weight
+
+        total = weights.sum()
+        if total > 0:
+            weights /= total
+        return weights
+
+    def ordered_moves(self, color_code: int, limit: int | None = None) -> list[tuple[tuple[int, int], float]]:
+        """Допустимые ходы по убыванию априорной вероятности."""
+        priors = self.priors(color_code)
+        flat = np.argsort(-priors, axis=None, kind="stable")
+        count = int(np.count_nonzero(priors))
+        if limit is not None:
+            count = min(count, limit)
+        cols, rows = np.unravel_index(flat[:count], priors.shape)
+        return [((col, row), prior) for col, row, prior in
+                zip(cols.tolist(), rows.tolist(), priors[cols, rows].tolist())]
+
+
+def train_weights(games: list, min_seen: int = 5) -> PatternWeights:
+    """
+    Вес шаблона = доля случаев, когда сыгран ход с этим шаблоном, среди всех ходов, где он был доступен.
+    """
+    seen_3: dict[int, int] = {}
+    played_3: dict[int, int] = {}
+    seen_5: dict[int, int] = {}
+    played_5: dict[int, int] = {}
+    for game in games:
+        logic = game_logic(game.size)
+        board = np.zeros((game.size, game.size))
+        patterns = PatternBoard(game.size, PatternWeights())
+        for color_code, move in game.moves:
+            if move is None:
+                continue
+            patterns.sync(board)
+            hash_3, hash_5 = patterns._hashes(color_code)
+            empty = board == 0
+            for hashes, seen in ((hash_3, seen_3), (hash_5, seen_5)):
+                for value in hashes[empty].tolist():
+                    seen[value] = seen.get(value, 0) + 1
+            col, row = move
+            if not logic.is_valid_move(col, row, board):
+                break
+            h3, h5 = patterns.pattern_hashes(col, row, color_code)
+            played_3[h3] = played_3.get(h3, 0) + 1
+            played_5[h5] = played_5.get(h5, 0) + 1
+            board[col, row] = color_code
+            logic.resolve_captures(board, col, row)
+
+    def to_weights(seen: dict[int, int], played: dict[int, int]) -> dict[int, float]:
+        # Масштаб: средний ход ~ 1.0, как у эвристики для неизвестных шаблонов
+        base = sum(played.values()) / max(1, sum(seen.values()))
+        return {value: played[value] / seen[value] / base
+                for value in played if seen.get(value, 0) >= min_seen}
+
+    return PatternWeights(to_weights(seen_3, played_3), to_weights(seen_5, played_5))
+
+
+if __name__ == "__main__":
+    from sgf import read_sgf
+
+    parser = argparse.ArgumentParser(description="Построение таблицы весов шаблонов из SGF-партий")
+    parser.add_argument("games", nargs="+", help="файлы .sgf")
+    parser.add_argument("--out", default=PATTERN_WEIGHTS_PATH)
+    parser.add_argument("--min-seen", type=int, default=5)
+    args = parser.parse_args()
+
+    table = train_weights([read_sgf(path) for path in args.games], args.min_seen)
+    table.save(args.out)
+    print(f"Шаблонов 3x3: {len(table.weights_3)}, 5x5: {len(table.weights_5)} -> {args.out}")
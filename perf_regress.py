@@ -0,0 +1,135 @@
+import argparse
+import hashlib
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import memprof
+from ai import ComputerPlayer
+from main_logic import game_logic
+from patterns import PatternWeights
+from settings import *
+from transposition import TranspositionTable
+
+
+def _git_revision() -> str | None:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ("-dirty" if dirty else "")
+
+
+def replay(size: int, seed: int, moves: int, random_opening: int) -> tuple[list[tuple[int, int] | None], list[int]]:
+    """
+    Партия компьютера с самим собой с фиксированным зерном: первые random_opening ходов случайные,
+    дальше best_move без ограничения по времени. Возвращает ходы и время каждого хода в нс.
+    """
+    rng = random.Random(seed)
+    # Своя таблица транспозиций, без дебютной книги и с пустыми весами шаблонов: результат не зависит
+    # от предыдущих партий в процессе и от того, какие файлы книги и весов лежат на диске
+    player = ComputerPlayer(size, transpositions=TranspositionTable(), use_book=False, rng=rng,
+                            weights=PatternWeights())
+    logic = game_logic(size)
+    board = np.zeros((size, size))
+    played: list[tuple[int, int] | None] = []
+    timings: list[int] = []
+    color_code = 1  # как в игре с компьютером, первыми ходят белые
+    for number in range(moves):
+        started = time.perf_counter_ns()
+        move = player.random_move(board) if number < random_opening else player.best_move(board, color_code)
+        timings.append(time.perf_counter_ns() - started)
+        played.append(move)
+        if move is not None:
+            board[move] = color_code
+            logic.resolve_captures(board, *move)
+        color_code = 3 - color_code
+    return played, timings
+
+
+def _digest(moves: list[tuple[int, int] | None]) -> str:
+    text = ";".join("pass" if move is None else f"{move[0]},{move[1]}" for move in moves)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def _previous(history_path: str, size: int, seed: int, moves: int) -> dict | None:
+    previous = None
+    try:
+        with open(history_path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # обрезанная строка прерванного запуска
+                if (record.get("size"), record.get("seed"), record.get("moves")) == (size, seed, moves):
+                    previous = record
+    except FileNotFoundError:
+        pass
+    return previous
+
+
+def run(sizes: list[int], seeds: list[int], moves: int, random_opening: int, history_path: str,
+        threshold: float) -> bool:
+    """Прогоняет все партии, дописывает историю и сравнивает с прошлым запуском. False — есть регрессия."""
+    revision = _git_revision()
+    ok = True
+    for size in sizes:
+        for seed in seeds:
+            played, timings = replay(size, seed, moves, random_opening)
+            timings_ms = [value / 1e6 for value in timings[random_opening:]] or [0.0]
+            record = {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "revision": revision,
+                "python": platform.python_version(),
+                "size": size,
+                "seed": seed,
+                "moves": moves,
+                "digest": _digest(played),
+                "median_ms": round(statistics.median(timings_ms), 3),
+                "mean_ms": round(statistics.fmean(timings_ms), 3),
+                "p95_ms": round(sorted(timings_ms)[int(len(timings_ms) * 0.95)], 3),
+                "total_s": round(sum(timings) / 1e9, 3),
+            }
+            previous = _previous(history_path, size, seed, moves)
+            with open(history_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+            line = f"{size}x{size} seed={seed}: медиана {record['median_ms']:.2f} мс/ход, p95 {record['p95_ms']:.2f} мс"
+            if previous is not None:
+                change = record["median_ms"] / previous["median_ms"] - 1 if previous["median_ms"] else 0.0
+                line += f" ({change:+.1%} к {previous.get('revision') or 'прошлому запуску'})"
+                if previous["digest"] != record["digest"]:
+                    # Другие ходы — другие позиции, время напрямую не сравнить
+                    line += "; ходы изменились"
+                elif change > threshold:
+                    line += "; РЕГРЕССИЯ"
+                    ok = False
+            print(line)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер времени хода на партиях с фиксированным зерном")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[9, 19])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--moves", type=int, default=40, help="ходов в каждой партии")
+    parser.add_argument("--random-opening", type=int, default=4, help="случайных ходов в начале партии")
+    parser.add_argument("--history", default=PERF_HISTORY_PATH, help="файл истории (JSON Lines)")
+    parser.add_argument("--threshold", type=float, default=PERF_REGRESSION_THRESHOLD,
+                        help="допустимый рост медианы времени хода")
+    parser.add_argument("--check", action="store_true", help="код возврата 1 при регрессии")
+    args = parser.parse_args()
+    # GO_MEMPROF=1 — заодно отчёт о памяти по ходам компьютера
+    memprof.install_from_env(("ai.best_move", "ai.random_move"))
+    passed = run(args.sizes, args.seeds, args.moves, args.random_opening, args.history, args.threshold)
+    if args.check and not passed:
+        sys.exit(1)
@@ -3,10 +3,18 @@
 import pygame
 from pygame import gfxdraw
 import itertools
+from typing import TYPE_CHECKING
 import numpy as np
-from point import Point
+from assets import StoneSprites, get_font, get_stone_sprites
+from geometry import BoardGeometry, get_geometry
 from settings import *
-from main_logic import game_logic
+
+if TYPE_CHECKING:
+    from analysis import AnalysisResult
+    from clocks import GameClock
+    from networker import NetworkStats
+
+
 class Renderer:
     def __init__(self, size: int, screen: pygame.Surface, board_offset_x: int, board_offset_y: int, font: pygame.font.Font):
         self._size = size
@@ -14,51 +22,51 @@ class Renderer:
         self._board_offset_x = board_offset_x
         self._board_offset_y = board_offset_y
         self._font = font
-        self._game_logic = game_logic(self._size)
+        self._geometry: BoardGeometry = get_geometry(self._size, self._board_offset_x, self._board_offset_y)
 
-        self._stone_scale_factor = board_scale[self._size]
+        self._sprites: StoneSprites = get_stone_sprites(self._geometry.stone_size)
 
-        self._black_stone_image: pygame.Surface = pygame.image.load("black_stone.png")
-        self._white_stone_image: pygame.Surface = pygame.image.load("white_stone.png")
-
-        new_size: int = int(STONE_RADIUS * 2 * self._stone_scale_factor)
-        self._black_stone_image = pygame.transform.scale(self._black_stone_image, (new_size, new_size))
-        self._white_stone_image = pygame.transform.scale(self._white_stone_image, (new_size, new_size))
+        self._previous_screen = pygame.Surface(self._screen.get_size())
+        self._clock_text: list[str] | None = None
+        self._network_text: list[str] | None = None
+        self._network_background: pygame.Surface | None = None  # фон под статистикой сети с последней полной отрисовки
+        self._analysis: 'AnalysisResult | None' = None
+        self._analysis_overlay: pygame.Surface | None = None  # выделяется один раз на размер экрана
+        self._analysis_frame: pygame.Surface | None = None  # кадр последней полной отрисовки без слоя анализа
 
+    def resize(self, screen: pygame.Surface, board_offset_x: int, board_offset_y: int) -> None:
+        self._screen = screen
+        self._board_offset_x = board_offset_x
+        self._board_offset_y = board_offset_y
+        self._geometry = get_geometry(self._size, self._board_offset_x, self._board_offset_y)
         self._previous_screen = pygame.Surface(self._screen.get_size())
+        self._analysis_frame = None
+        self.set_analysis(self._analysis)
 
-    def _clear_screen(self, start_points: list[Point], end_points: list[Point]) -> None:
+    def _clear_screen(self) -> None:
         self._previous_screen.blit(self._screen, (0, 0))
         self._screen.fill((BOARD_BROWN.r, BOARD_BROWN.g, BOARD_BROWN.b))
+        start_points, end_points = self._geometry.grid_lines
         for start_point, end_point in zip(start_points, end_points):
-            start_point_screen: Point = Point(
-                start_point.x + self._board_offset_x,
-                start_point.y + self._board_offset_y,
-            )
-            end_point_screen: Point = Point(
-                end_point.x + self._board_offset_x,
-                end_point.y + self._board_offset_y,
-            )
             pygame.draw.line(self._screen, (BLACK.r, BLACK.g, BLACK.b),
-                             (start_point_screen.x, start_point_screen.y),
-                             (end_point_screen.x, end_point_screen.y), width=2)
+                             (start_point.x, start_point.y),
+                             (end_point.x, end_point.y), width=2)
 
         guide_dots: list[int] = [3, self._size // 2, self._size - 4]
         for col, row in itertools.product(guide_dots, guide_dots):
-            point: Point = Point(0, 0)
-            point = self._game_logic.colrow_to_point(col, row)
-            res_point = Point(point.x + self._board_offset_x,
-                              point.y + self._board_offset_y)
-            gfxdraw.aacircle(self._screen, res_point.x, res_point.y, DOT_RADIUS,
+            x, y = self._geometry.colrow_to_screen(col, row)
+            gfxdraw.aacircle(self._screen, x, y, DOT_RADIUS,
                              (BLACK.r, BLACK.g, BLACK.b))
-            gfxdraw.filled_circle(self._screen, res_point.x, res_point.y,
+            gfxdraw.filled_circle(self._screen, x, y,
                                   DOT_RADIUS, (BLACK.r, BLACK.g, BLACK.b))
 
     def draw(self, board: np.ndarray, prisoners: dict[str, int], black_turn: bool, move_log: list[str], esc_button_hovered: bool,
-             start_points: list[Point], end_points: list[Point], mode: str):
-        self._clear_screen(start_points, end_points)
-        self._draw_stone_image(board, self._white_stone_image, 1)
-        self._draw_stone_image(board, self._black_stone_image, 2)
+             mode: str, last_move: tuple[int, int] | None = None, hover: tuple[int, int] | None = None,
+             network_stats: 'NetworkStats | None' = None, clock: 'GameClock | None' = None):
+        self._clear_screen()
+        self._draw_stone_image(board, self._sprites.white, 1)
+        self._draw_stone_image(board, self._sprites.black, 2)
+        self._draw_markers(board, black_turn, last_move, hover)
 
         score_msg: str = (
             f"Захвачено белых камней: {prisoners['white']} "
@@ -108,16 +116,144 @@ class Renderer:
         self._draw_esc_button(esc_button_hovered)
         if mode != GameModes.ONLINE:
             self._draw_buttons()
+        if network_stats is not None:
+            self._network_text = None
+            self._network_background = self._screen.subsurface(self._network_rect()).copy()
+            self.draw_network_stats(network_stats, update=False)
+        if clock is not None:
+            self._clock_text = None
+            self.draw_clock(clock, update=False)
+        if mode == GameModes.ANALYSIS:
+            # Слой анализа — поверх готового кадра, чтобы новый результат не требовал полной перерисовки
+            if self._analysis_frame is None or self._analysis_frame.get_size() != self._screen.get_size():
+                self._analysis_frame = pygame.Surface(self._screen.get_size())
+            self._analysis_frame.blit(self._screen, (0, 0))
+            if self._analysis is not None:
+                self._screen.blit(self._analysis_overlay, (0, 0))
         pygame.display.flip()
 
     def _draw_stone_image(self, board: np.ndarray, stone_image: pygame.Surface, board_value: int) -> None:
-        for col, row in zip(*np.where(board == board_value)):
-            point = Point(0, 0)
-            point = self._game_logic.colrow_to_point(col, row)
-            point = Point(point.x + self._board_offset_x, point.y + self._board_offset_y)
-            self._screen.blit(stone_image,
-                              (point.x - stone_image.get_width() // 2,
-                              point.y - stone_image.get_height() // 2))
+        half_width = stone_image.get_width() // 2
+        half_height = stone_image.get_height() // 2
+        cols, rows = np.nonzero(board == board_value)
+        self._screen.blits([(stone_image, (x - half_width, y - half_height))
+                            for x, y in self._geometry.pixels[cols, rows].tolist()], doreturn=False)
+
+    def _draw_markers(self, board: np.ndarray, black_turn: bool, last_move: tuple[int, int] | None,
+                      hover: tuple[int, int] | None) -> None:
+        half = self._geometry.stone_size // 2
+        if last_move is not None and board[last_move] != 0:
+            x, y = self._geometry.colrow_to_screen(*last_move)
+            self._screen.blit(self._sprites.last_for_color(board[last_move]), (x - half, y - half))
+        if hover is not None and board[hover] == 0:
+            x, y = self._geometry.colrow_to_screen(*hover)
+            self._screen.blit(self._sprites.hover_for_color(2 if black_turn else 1), (x - half, y - half))
+
+    def set_analysis(self, result: 'AnalysisResult | None') -> None:
+        """
+        Пересобирает слой анализа (территория, кандидаты, доля побед). Вызывается только при новом
+        результате; при обычной перерисовке слой накладывается готовым.
+        """
+        self._analysis = result
+        if result is None:
+            return
+        if self._analysis_overlay is None or self._analysis_overlay.get_size() != self._screen.get_size():
+            self._analysis_overlay = pygame.Surface(self._screen.get_size(), pygame.SRCALPHA)
+        overlay = self._analysis_overlay
+        overlay.fill((0, 0, 0, 0))
+        square = max(4, self._geometry.stone_size // 3)
+        for (col, row), owner in np.ndenumerate(result.ownership):
+            if abs(owner) < 0.2:
+                continue
+            x, y = self._geometry.colrow_to_screen(col, row)
+            shade = 0 if owner > 0 else 255
+            overlay.fill((shade, shade, shade, int(200 * abs(owner))),
+                         pygame.Rect(x - square // 2, y - square // 2, square, square))
+
+        small_font = get_font("Comic Sans", 20)
+        radius = self._geometry.stone_size // 2 - 2
+        for rank, ((col, row), win_rate, visits) in enumerate(result.candidates):
+            x, y = self._geometry.colrow_to_screen(col, row)
+            color = (40, 170, 60) if rank == 0 else (60, 120, 200)
+            gfxdraw.filled_circle(overlay, x, y, radius, (*color, 170))
+            gfxdraw.aacircle(overlay, x, y, radius, (*color, 255))
+            label = small_font.render(f"{win_rate * 100:.0f}", True, (BLACK.r, BLACK.g, BLACK.b))
+            overlay.blit(label, label.get_rect(center=(x, y)))
+
+        summary = self._font.render(
+            f"Чёрные: {result.black_win_rate * 100:.1f}%  ({result.playouts} партий)", True,
+            (BLACK.r, BLACK.g, BLACK.b))
+        # Часов в режиме анализа нет: сводка занимает их место
+        overlay.blit(summary, summary.get_rect(topright=(self._screen.get_width() - 10, CLOCK_RECT[1])))
+
+    def draw_analysis(self, result: 'AnalysisResult') -> None:
+        """
+        Новый результат для той же позиции: кадр восстанавливается из копии последней полной
+        отрисовки, и сверху накладывается пересобранный слой.
+        """
+        self.set_analysis(result)
+        if self._analysis_frame is None:
+            return
+        self._screen.blit(self._analysis_frame, (0, 0))
+        self._screen.blit(self._analysis_overlay, (0, 0))
+        pygame.display.flip()
+
+    def _network_rect(self) -> pygame.Rect:
+        # До трёх строк статистики внизу экрана
+        return pygame.Rect(0, self._screen.get_height() - 120, self._screen.get_width(), 120)
+
+    def draw_network_stats(self, stats: 'NetworkStats', update: bool = True) -> None:
+        """
+        Статистика соединения. Как и часы, между полными перерисовками обновляется только её область,
+        и только когда меняется текст.
+        """
+        def ms(value: float | None) -> str:
+            return "—" if value is None else f"{value:.1f}"
+
+        lines = [
+            f"RTT {ms(stats.rtt_ms)} мс (ср. {ms(stats.rtt_avg_ms)}), смещение часов {ms(stats.clock_offset_ms)} мс",
+            f"Отправлено {stats.bytes_sent} Б / {stats.messages_sent}, получено {stats.bytes_received} Б / "
+            f"{stats.messages_received}, опрос каждые {ms(stats.poll_interval_ms)} мс",
+        ]
+        if stats.stalled:
+            lines.append("Соперник не отвечает" if stats.connected else "Соединение разорвано")
+            lines[-1] += f" ({stats.last_receive_age_s:.0f} с)"
+        if lines == self._network_text:
+            return
+        self._network_text = lines
+        rect = self._network_rect()
+        if self._network_background is not None:
+            self._screen.blit(self._network_background, rect)
+        screen_height = self._screen.get_height()
+        for index, line in enumerate(lines):
+            color = (200, 0, 0) if stats.stalled and index == 2 else (BLACK.r, BLACK.g, BLACK.b)
+            text = self._font.render(line, True, color)
+            self._screen.blit(text, (10, screen_height - 40 * (len(lines) - index)))
+        if update:
+            pygame.display.update(rect)
+
+    def _clock_rect(self) -> pygame.Rect:
+        x, y, width, height = CLOCK_RECT
+        return pygame.Rect(self._screen.get_width() + x, y, width, height)
+
+    def draw_clock(self, clock: 'GameClock', update: bool = True) -> None:
+        """
+        Часы партии. Между полными перерисовками обновляется только область часов,
+        и только когда меняется показываемое время.
+        """
+        lines = [f"{'> ' if clock.running == color else '   '}{name}: {clock.format(color)}"
+                 for color, name in ((Colors.BLACK, "Чёрные"), (Colors.WHITE, "Белые"))]
+        if lines == self._clock_text:
+            return
+        self._clock_text = lines
+        rect = self._clock_rect()
+        self._screen.fill((BOARD_BROWN.r, BOARD_BROWN.g, BOARD_BROWN.b), rect)
+        for index, line in enumerate(lines):
+            color = (200, 0, 0) if line.endswith("время вышло") else (BLACK.r, BLACK.g, BLACK.b)
+            text = self._font.render(line, True, color)
+            self._screen.blit(text, (rect.x + 10, rect.y + 5 + index * 42))
+        if update:
+            pygame.display.update(rect)
 
     def _draw_buttons(self) -> None:
         screen_height = self._screen.get_height()
@@ -1,7 +1,11 @@
 import enum
+import os
 
 from rgb import Rgb
 
+# Файлы данных (веса шаблонов, дебютная книга) лежат рядом с кодом, как и картинки в assets.py
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
 BOARD_BROWN = Rgb(186, 138, 69)
 BOARD_WIDTH = 1000
 BOARD_BORDER = 120
@@ -15,6 +19,46 @@ BUTTON_HOVER_COLOR = Rgb(100, 100, 100)
 BOARD_SIZES = [8, 9, 13, 19]
 antialias_on = True
 board_scale = {8: 1, 9: 0.9, 13: 0.7, 19: 0.5}
+STARTUP_BUDGET_MS = 1500
+PATTERN_WEIGHTS_PATH = os.path.join(DATA_DIR, "patterns.bin")
+AI_CANDIDATE_LIMIT = 60
+AI_PRIOR_WEIGHT = 2.0
+TT_MAX_BYTES = 16 * 1024 * 1024
+OPENING_BOOK_PATH = os.path.join(DATA_DIR, "opening_book.bin")
+TACTICS_NODE_LIMIT = 400
+TACTICS_MEMO_LIMIT = 100_000
+TACTICS_LOSS_PENALTY = 6
+TACTICS_CAPTURE_BONUS = 8
+TACTICS_SUICIDE_PENALTY = 1000  # ход без дыханий и без снятия камней — самоубийство
+AUTOSAVE_DIR = ".autosave"
+JOURNAL_FLUSH_INTERVAL = 0.05  # с, окно групповой фиксации
+JOURNAL_SNAPSHOT_EVERY = 50  # записей журнала между снимками
+HEARTBEAT_INTERVAL = 1.0  # с между ping
+NETWORK_STALL_TIMEOUT = 5.0  # с без данных от соперника
+RTT_SMOOTHING = 0.2
+LEGACY_MESSAGE_TIMEOUT = 0.3  # с тишины, после которых ход старого формата без перевода строки считается полным
+TIME_CONTROL_KIND = "byoyomi"  # "absolute", "fischer" или "byoyomi"
+TIME_MAIN_S = 600  # основное время, с
+TIME_INCREMENT_S = 5  # добавка за ход (Фишер), с
+TIME_PERIODS = 5  # периоды бёё-ёми
+TIME_PERIOD_S = 30  # длина периода бёё-ёми, с
+AI_TIME_SAFETY = 0.8  # доля периода или добавки, которую компьютер готов потратить
+AI_MIN_MOVES_LEFT = 20
+CLOCK_RECT = (-330, 10, 320, 90)  # область часов от правого края экрана: x, y, ширина, высота
+KOMI = 6.5
+ANALYSIS_REPORT_INTERVAL = 0.25  # с между результатами анализа
+ANALYSIS_MAX_PLAYOUTS = 20_000  # на позицию, дальше процесс анализа простаивает
+ANALYSIS_CACHE_POSITIONS = 256
+ANALYSIS_CANDIDATES = 5
+ANALYSIS_MIN_VISITS = 10
+PERF_HISTORY_PATH = "perf_history.jsonl"
+PERF_REGRESSION_THRESHOLD = 0.10  # допустимый рост медианы времени хода
+TOURNAMENT_RESULTS_PATH = "tournament.jsonl"
+TOURNAMENT_MARGIN = 40  # перевес по площади, при котором партия присуждается
+ADJUDICATE_EVERY = 10  # ходов между проверками перевеса
+MEMPROF_REPORT_PATH = "memprof.json"
+MEMPROF_SNAPSHOT_EVERY = 20  # снимок tracemalloc на каждый N-й вызов операции
+MEMPROF_TOP_SITES = 10
 
 
 class GameModes(enum.StrEnum):
@@ -22,6 +66,13 @@ class GameModes(enum.StrEnum):
     EASY = "Лёгкий"
     DIFFICULTY = "Сложный"
     ONLINE = "Играть по сети"
+    ANALYSIS = "Анализ"
+
+
+class TimeControlKind(enum.StrEnum):
+    ABSOLUTE = "absolute"
+    FISCHER = "fischer"
+    BYOYOMI = "byoyomi"
 
 
 class Colors(enum.StrEnum):
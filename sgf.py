@@ -0,0 +1,34 @@
+import re
+from dataclasses import dataclass, field
+
+_PROPERTY_RE = re.compile(r";\s*([BW])\[([a-z]{0,2})\]")
+_SIZE_RE = re.compile(r"SZ\[(\d+)\]")
+
+
+@dataclass
+class SgfGame:
+    size: int
+    # (код цвета: 1 — белые, 2 — чёрные, (col, row) или None для паса)
+    moves: list[tuple[int, tuple[int, int] | None]] = field(default_factory=list)
+
+
+def parse_sgf(text: str) -> SgfGame:
+    """
+    Минимальный разбор SGF: размер доски и ходы по порядку записи (варианты и расстановка не поддерживаются).
+    """
+    size_match = _SIZE_RE.search(text)
+    game = SgfGame(size=int(size_match.group(1)) if size_match else 19)
+    for color, coords in _PROPERTY_RE.findall(text):
+        color_code = 2 if color == "B" else 1
+        if len(coords) != 2 or (coords == "tt" and game.size <= 19):
+            game.moves.append((color_code, None))
+            continue
+        col = ord(coords[0]) - ord("a")
+        row = ord(coords[1]) - ord("a")
+        game.moves.append((color_code, (col, row)))
+    return game
+
+
+def read_sgf(path: str) -> SgfGame:
+    with open(path, encoding="utf-8", errors="replace") as file:
+        return parse_sgf(file.read())
@@ -0,0 +1,101 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Момент импорта модуля ~ момент запуска go.py: модуль импортируется первым
+LAUNCH_TIME_NS: int = time.perf_counter_ns()
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Выставляется из go.py: завершить процесс сразу после первого кадра меню
+exit_after_first_frame: bool = False
+
+_marks: dict[str, int] = {}
+
+
+def mark(name: str) -> float:
+    """
+    Запоминает время (мс от запуска) первого наступления события name.
+    """
+    if name not in _marks:
+        _marks[name] = time.perf_counter_ns() - LAUNCH_TIME_NS
+    return _marks[name] / 1e6
+
+
+def elapsed_ms(name: str) -> float | None:
+    value = _marks.get(name)
+    return None if value is None else value / 1e6
+
+
+def report() -> str:
+    return ", ".join(f"{name}: {value / 1e6:.1f} мс" for name, value in _marks.items())
+
+
+def first_menu_frame() -> None:
+    if "first_menu_frame" in _marks:
+        return
+    mark("first_menu_frame")
+    if exit_after_first_frame:
+        # Отметки нужны только при замере запуска; в обычной игре ничего не печатаем
+        print(f"Время запуска: {report()}")
+        print(f"STARTUP_MS={elapsed_ms('first_menu_frame'):.3f}", flush=True)
+        sys.exit(0)
+
+
+def _import_times(statement: str) -> list[tuple[int, int, str]]:
+    """
+    Запускает отдельный интерпретатор с -X importtime и возвращает (self мкс, cumulative мкс, модуль).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT_DIR, capture_output=True, text=True)
+    times: list[tuple[int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return times
+
+
+def import_time_report(top: int = 15) -> str:
+    lines: list[str] = []
+    for title, statement in (("До меню (import go)", "import go"),
+                             ("Отложенно (import game)", "import go, game")):
+        times = _import_times(statement)
+        total = sum(self_us for self_us, _, _ in times)
+        lines.append(f"{title}: {total / 1000:.1f} мс, модулей: {len(times)}")
+        for self_us, cumulative_us, name in sorted(times, key=lambda t: t[1], reverse=True)[:top]:
+            lines.append(f"  {cumulative_us / 1000:8.1f} мс  (собств. {self_us / 1000:6.1f})  {name}")
+    return "\n".join(lines)
+
+
+def measure_first_frame() -> tuple[float, float]:
+    """
+    Запускает go.py до первого кадра меню. Возвращает (время по часам процесса, полное время с запуском), мс.
+    """
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT_DIR, "go.py"), "--exit-after-first-frame"],
+                            cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=60)
+    wall_ms = (time.perf_counter() - started) * 1000
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_MS="):
+            return float(line.split("=", 1)[1]), wall_ms
+    raise RuntimeError(f"go.py не отрисовал меню:\n{result.stdout}{result.stderr}")
+
+
+def check_startup_budget(budget_ms: float, runs: int = 3) -> bool:
+    """
+    Проверка регрессии холодного старта: медиана полного времени до первого кадра меню не превышает бюджет.
+    """
+    in_process, wall = zip(*(measure_first_frame() for _ in range(runs)))
+    median_wall = statistics.median(wall)
+    print(f"Первый кадр меню: {statistics.median(in_process):.1f} мс после импорта startup, "
+          f"{median_wall:.1f} мс с запуска процесса (медиана из {runs}), бюджет {budget_ms:.0f} мс")
+    if median_wall > budget_ms:
+        print("Бюджет времени запуска превышен")
+        return False
+    return True
@@ -0,0 +1,171 @@
+import numpy as np
+
+from main_logic import game_logic
+from point import Point
+from settings import *
+from zobrist import position_hash, update_hash
+
+
+class _NodeLimitReached(Exception):
+    pass
+
+
+class TacticalReader:
+    """
+    Быстрое чтение тактики: взятие групп, лестницы и уход из атари.
+    Атакующий отвечает только ходами в дыхания цели (пока у неё не больше двух дыханий),
+    защитник — наращиванием и взятием соседних групп в атари. Перебор ограничен числом узлов,
+    результаты запоминаются по хэшу позиции.
+    """
+
+    def __init__(self, size: int, node_limit: int = TACTICS_NODE_LIMIT) -> None:
+        self._size = size
+        self._logic = game_logic(size)
+        self._node_limit = node_limit
+        self._nodes = 0
+        self._memo: dict[tuple[int, Point, str], bool] = {}
+        self._board: np.ndarray = np.zeros((size, size), dtype=np.int8)
+        self._hash = 0
+
+    @property
+    def nodes(self) -> int:
+        """Число узлов в последнем запросе."""
+        return self._nodes
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def can_capture(self, board: np.ndarray, point: Point) -> bool:
+        """
+        Может ли атакующий (ходит он) взять группу, в которую входит point.
+        """
+        return self._query(board, point, "attack", default=False)
+
+    def can_escape(self, board: np.ndarray, point: Point) -> bool:
+        """
+        Может ли группа в point уйти от взятия, если ход защитника.
+        """
+        return self._query(board, point, "defend", default=True)
+
+    def ladder_works(self, board: np.ndarray, point: Point) -> bool:
+        """
+        Работает ли лестница против группы в point: в атари при ходе защитника
+        или с двумя дыханиями при ходе атакующего.
+        """
+        group = self._logic.get_group(board, point)
+        liberties = self._logic.count_liberties(board, group)
+        if liberties == 1:
+            return not self.can_escape(board, point)
+        if liberties == 2:
+            return self.can_capture(board, point)
+        return False
+
+    def _query(self, board: np.ndarray, point: Point, kind: str, default: bool) -> bool:
+        if board[point.x, point.y] == 0:
+            return False if kind == "attack" else True
+        if len(self._memo) > TACTICS_MEMO_LIMIT:
+            self._memo.clear()
+        self._board = board.astype(np.int8)
+        self._hash = position_hash(self._board, black_to_move=False)
+        self._nodes = 0
+        try:
+            return self._attack(point) if kind == "attack" else self._defend(point)
+        except _NodeLimitReached:
+            # Результат не доказан — считаем, что группа жива
+            return default
+
+    def _visit(self, point: Point, kind: str) -> tuple[int, Point, str]:
+        self._nodes += 1
+        if self._nodes > self._node_limit:
+            raise _NodeLimitReached()
+        return self._hash, point, kind
+
+    def _play(self, col: int, row: int, color_code: int) -> list[Point] | None:
+        """
+        Ставит камень и снимает взятые группы. Возвращает снятые камни или None для самоубийства.
+        """
+        board = self._board
+        board[col, row] = color_code
+        self._hash = update_hash(self._hash, self._size, col, row, 0, color_code)
+        stone = {Point(col, row)}
+        captured: list[Point] = []
+        for group in self._logic.get_adjacent_groups(board, stone, 3 - color_code):
+            if not self._logic.get_liberties(board, group):
+                captured.extend(group)
+        for captured_point in captured:
+            board[captured_point.x, captured_point.y] = 0
+            self._hash = update_hash(self._hash, self._size, captured_point.x, captured_point.y, 3 - color_code, 0)
+        if not captured and not self._logic.get_liberties(board, self._logic.get_group(board, Point(col, row))):
+            self._undo(col, row, color_code, captured)
+            return None
+        return captured
+
+    def _undo(self, col: int, row: int, color_code: int, captured: list[Point]) -> None:
+        for captured_point in captured:
+            self._board[captured_point.x, captured_point.y] = 3 - color_code
+            self._hash = update_hash(self._hash, self._size, captured_point.x, captured_point.y, 0, 3 - color_code)
+        self._board[col, row] = 0
+        self._hash = update_hash(self._hash, self._size, col, row, color_code, 0)
+
+    def _attack(self, point: Point) -> bool:
+        """Ход атакующего: True, если группа в point будет взята."""
+        key = self._visit(point, "attack")
+        if key in self._memo:
+            return self._memo[key]
+        board = self._board
+        color_code = int(board[point.x, point.y])
+        group = self._logic.get_group(board, point)
+        liberties = self._logic.get_liberties(board, group)
+
+        result = False
+        if len(liberties) == 1:
+            result = True
+        elif len(liberties) == 2:
+            for liberty in sorted(liberties, key=lambda p: (p.x, p.y)):
+                captured = self._play(liberty.x, liberty.y, 3 - color_code)
+                if captured is None:
+                    continue
+                escaped = self._defend(point)
+                self._undo(liberty.x, liberty.y, 3 - color_code, captured)
+                if not escaped:
+                    result = True
+                    break
+        self._memo[key] = result
+        return result
+
+    def _defend(self, point: Point) -> bool:
+        """Ход защитника: True, если группа в point уходит от взятия."""
+        key = self._visit(point, "defend")
+        if key in self._memo:
+            return self._memo[key]
+        board = self._board
+        color_code = int(board[point.x, point.y])
+        group = self._logic.get_group(board, point)
+        liberties = self._logic.get_liberties(board, group)
+
+        if len(liberties) != 1:
+            # Без атари защитник может сыграть в другом месте
+            result = len(liberties) > 2 or not self._attack(point)
+            self._memo[key] = result
+            return result
+
+        # Кандидаты: взятие соседних групп в атари и наращивание в последнее дыхание
+        moves: list[Point] = []
+        for enemy_group in self._logic.get_adjacent_groups(board, group, 3 - color_code):
+            enemy_liberties = self._logic.get_liberties(board, enemy_group)
+            if len(enemy_liberties) == 1:
+                moves.extend(enemy_liberties)
+        moves.extend(liberties)
+
+        result = False
+        for move in dict.fromkeys(moves):
+            captured = self._play(move.x, move.y, color_code)
+            if captured is None:
+                continue
+            escaped = not self._attack(point)
+            self._undo(move.x, move.y, color_code, captured)
+            if escaped:
+                result = True
+                break
+        self._memo[key] = result
+        return result
@@ -0,0 +1,20 @@
+import random
+
+import numpy as np
+
+import ai
+from ai import ComputerPlayer
+from transposition import TranspositionTable
+
+
+def test_capture_outside_pattern_candidates_is_considered(monkeypatch):
+    # Шаблонных кандидатов почти нет, но захват белой группы в атари всё равно должен найтись
+    monkeypatch.setattr(ai, "AI_CANDIDATE_LIMIT", 1)
+    board = np.zeros((19, 19))
+    for row in (15, 16, 17):
+        board[18, row] = 1
+        board[17, row] = 2
+    board[18, 14] = 2
+    player = ComputerPlayer(19, transpositions=TranspositionTable(), use_book=False, rng=random.Random(0))
+    assert (18, 18) in [move for _, move in player.score_moves(board, 2)]
+    assert player.best_move(board, 2) == (18, 18)
@@ -0,0 +1,55 @@
+import queue
+import threading
+
+import analysis
+
+
+def _run_worker(requests: queue.Queue, results: queue.Queue) -> threading.Thread:
+    # Цикл процесса анализа в потоке этого же процесса: протокол тот же, очереди обычные
+    thread = threading.Thread(target=analysis._worker, args=(5, requests, results, 0), daemon=True)
+    thread.start()
+    return thread
+
+
+def _position(key: int) -> tuple[int, list[int], int]:
+    cells = [0] * 25
+    cells[key % 25] = 1
+    return key, cells, 2
+
+
+def _wait_finished(results: queue.Queue, key: int) -> analysis.AnalysisResult:
+    while True:
+        result = results.get(timeout=10)
+        if result.key == key and result.playouts >= analysis.ANALYSIS_MAX_PLAYOUTS:
+            return result
+
+
+def test_stop_after_position_is_not_lost():
+    requests, results = queue.Queue(), queue.Queue()
+    requests.put("stop")
+    requests.put(_position(1))
+    thread = _run_worker(requests, results)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert results.empty()
+
+
+def test_revisited_position_comes_from_cache(monkeypatch):
+    monkeypatch.setattr(analysis, "ANALYSIS_MAX_PLAYOUTS", 30)
+    requests, results = queue.Queue(), queue.Queue()
+    thread = _run_worker(requests, results)
+
+    requests.put(_position(1))
+    first = _wait_finished(results, 1)
+    requests.put(_position(2))
+    _wait_finished(results, 2)
+    # Возврат к разобранной позиции: прежний результат сразу, без новых партий
+    requests.put(_position(1))
+    cached = results.get(timeout=10)
+    requests.put("stop")
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert cached.key == 1 and cached.playouts == first.playouts == 30
+    assert cached.black_win_rate == first.black_win_rate
+    assert results.empty()
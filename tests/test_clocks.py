@@ -0,0 +1,35 @@
+from clocks import NS_PER_S, GameClock, TimeControl
+from settings import *
+
+
+class _Timer:
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def test_fischer_increment_only_for_completed_moves():
+    timer = _Timer()
+    clock = GameClock(TimeControl(TimeControlKind.FISCHER, 60, increment_s=5), timer)
+    clock.start(Colors.WHITE)
+    timer.now += 2 * NS_PER_S
+    clock.switch(Colors.BLACK)
+    assert clock.remaining(Colors.WHITE).main_ns == 63 * NS_PER_S
+    # Отмена и возврат хода туда-обратно не добавляют времени
+    for _ in range(5):
+        clock.switch(Colors.WHITE, completed_move=False)
+        clock.switch(Colors.BLACK, completed_move=False)
+    assert clock.remaining(Colors.WHITE).main_ns == 63 * NS_PER_S
+    assert clock.remaining(Colors.BLACK).main_ns == 60 * NS_PER_S
+
+
+def test_stopped_clock_charges_nobody():
+    timer = _Timer()
+    clock = GameClock(TimeControl(TimeControlKind.ABSOLUTE, 60), timer)
+    clock.start(Colors.BLACK)
+    clock.stop()
+    timer.now += 10 * NS_PER_S
+    clock.start(Colors.BLACK)
+    assert clock.remaining(Colors.BLACK).main_ns == 60 * NS_PER_S
@@ -0,0 +1,82 @@
+import pytest
+
+import gtp
+from gtp import GtpEngine, GtpError
+
+
+def _run(engine: GtpEngine, *commands: str) -> list[str]:
+    return [engine.handle(command)[0] for command in commands]
+
+
+def test_play_rejects_suicide():
+    engine = GtpEngine(9, seed=0)
+    assert _run(engine, "play b B1", "play b A2") == ["=\n\n", "=\n\n"]
+    board = engine.board.copy()
+    assert engine.handle("play w A1")[0] == "? illegal move\n\n"
+    assert (engine.board == board).all()
+    # Неудачный ход не попадает в историю: undo отменяет последний настоящий ход
+    engine.handle("undo")
+    assert engine.board.sum() == 2
+
+
+def test_capture_without_liberties_is_legal():
+    engine = GtpEngine(9, seed=0)
+    # Белые A2 и B1 в атари с общим последним дыханием A1; у камня чёрных в A1 соседи только белые
+    _run(engine, "play w A2", "play w B1", "play b A3", "play b B2", "play b C1")
+    assert engine.handle("play b A1")[0] == "=\n\n"
+    assert engine.board[0, 8] == 2  # A1
+    assert engine.board[0, 7] == engine.board[1, 8] == 0  # A2 и B1 сняты
+
+
+def test_occupied_point_is_illegal():
+    engine = GtpEngine(9, seed=0)
+    engine.play(2, (4, 4))
+    with pytest.raises(GtpError):
+        engine.play(1, (4, 4))
+
+
+def test_boardsize_errors():
+    engine = GtpEngine(9, seed=0)
+    assert engine.handle("boardsize -3")[0] == "? unacceptable size\n\n"
+    assert engine.handle("boardsize 99")[0] == "? unacceptable size\n\n"
+    assert engine.handle("boardsize x")[0] == "? boardsize not an integer\n\n"
+
+
+def test_internal_error_keeps_session(monkeypatch):
+    engine = GtpEngine(9, seed=0)
+
+    def broken(*args):
+        raise RuntimeError("сбой")
+
+    monkeypatch.setattr(engine, "area_score", broken)
+    assert engine.handle("7 final_score")[0] == "?7 internal error\n\n"
+    assert engine.handle("name")[0] == "= Go\n\n"
+
+
+@pytest.fixture
+def budgets(monkeypatch) -> list:
+    """Бюджеты времени, с которыми genmove вызывает ComputerPlayer.best_move."""
+    calls = []
+
+    def best_move(self, board, color_code=2, time_budget_s=None):
+        calls.append(time_budget_s)
+        return None
+
+    monkeypatch.setattr(gtp.ComputerPlayer, "best_move", best_move)
+    return calls
+
+
+def test_genmove_without_time_settings_is_unlimited(budgets):
+    engine = GtpEngine(9, seed=0)
+    _run(engine, "genmove b", "time_settings 0 10 0", "genmove w")  # 0 10 0 по GTP — без ограничения
+    assert budgets == [None, None]
+
+
+def test_genmove_budget_follows_time_left(budgets):
+    engine = GtpEngine(9, seed=0)
+    _run(engine, "time_settings 600 0 0", "genmove b", "time_left b 60 0", "genmove b")
+    full, short = budgets
+    assert 0 < short < full
+    # Канадское бёё-ёми: 30 с на 10 камней — не больше 3 с на ход
+    _run(engine, "time_settings 0 30 10", "time_left w 30 10", "genmove w")
+    assert 0 < budgets[-1] <= 3
@@ -0,0 +1,43 @@
+import numpy as np
+
+from journal import OP_PASS, OP_PLACE, OP_UNDO, GameJournal, GameState, recover
+from settings import *
+
+
+def _journal(directory) -> GameJournal:
+    journal = GameJournal(str(directory))
+    journal.start(GameState(9, GameModes.PVP, np.zeros((9, 9))))
+    return journal
+
+
+def test_move_log_is_trimmed_like_the_game(tmp_path):
+    journal = _journal(tmp_path)
+    color_code = 1
+    for index in range(6):
+        journal.append(OP_PLACE, color_code, index, 0)
+        color_code = 3 - color_code
+    # Отмена последнего хода: в игре лог из 4 записей теряет верхнюю, ранние ходы уже не видны
+    journal.append(OP_UNDO, 1, 5, 0)
+    journal.flush()
+    state = recover(str(tmp_path))
+    journal.close()
+    assert state.move_log == ["Белые: 5,1", "Чёрные: 4,1", "Белые: 3,1"]
+    assert state.last_move == (5, 0)
+
+
+def test_pass_changes_side_to_move(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append(OP_PASS)
+    journal.flush()
+    state = recover(str(tmp_path))
+    journal.close()
+    assert state.black_turn
+
+
+def test_snapshot_keeps_last_move(tmp_path):
+    journal = GameJournal(str(tmp_path))
+    journal.start(GameState(9, GameModes.PVP, np.zeros((9, 9)), last_move=(2, 3)))
+    journal.flush()
+    state = recover(str(tmp_path))
+    journal.close()
+    assert state.last_move == (2, 3)
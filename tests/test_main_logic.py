@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+
+from main_logic import game_logic
+from point import Point
+
+
+def _full_scan_captures(logic: game_logic, board: np.ndarray, col: int, row: int) -> int:
+    """Прежний вариант resolve_captures: проверка всех групп на доске."""
+    self_code = int(board[col, row])
+    captured = 0
+    for group in logic.get_stone_groups(board, 'white' if self_code == 2 else 'black'):
+        if logic.stone_group_has_no_liberties(board, group):
+            for point in group:
+                board[point.x, point.y] = 0
+            captured += len(group)
+    if not captured:
+        for group in logic.get_stone_groups(board, 'black' if self_code == 2 else 'white'):
+            if Point(col, row) in group:
+                if logic.stone_group_has_no_liberties(board, group):
+                    board[col, row] = 0
+                break
+    return captured
+
+
+def test_capture_into_eye_removes_both_groups():
+    logic = game_logic(9)
+    board = np.zeros((9, 9))
+    board[0, 7] = board[1, 8] = 1
+    board[0, 6] = board[1, 7] = board[2, 8] = 2
+    board[0, 8] = 2
+    assert logic.resolve_captures(board, 0, 8) == 2
+    assert board[0, 8] == 2 and board[0, 7] == board[1, 8] == 0
+
+
+def test_suicide_is_undone():
+    logic = game_logic(9)
+    board = np.zeros((9, 9))
+    board[0, 7] = board[1, 8] = 2
+    board[0, 8] = 1
+    assert logic.resolve_captures(board, 0, 8) == 0
+    assert board[0, 8] == 0
+
+
+def test_matches_full_board_scan_on_random_games():
+    rng = random.Random(7)
+    for size in (5, 9):
+        logic = game_logic(size)
+        board = np.zeros((size, size))
+        reference = board.copy()
+        for move_number in range(size * size * 3):
+            empty = list(zip(*np.nonzero(board == 0)))
+            if not empty:
+                break
+            col, row = rng.choice(empty)
+            color_code = 2 - move_number % 2
+            board[col, row] = reference[col, row] = color_code
+            assert logic.resolve_captures(board, col, row) == _full_scan_captures(logic, reference, col, row)
+            assert (board == reference).all()
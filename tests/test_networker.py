@@ -0,0 +1,57 @@
+import socket
+import time
+
+from networker import NetworkManager
+from point import Point
+from settings import *
+
+
+def _manager(role: str, conn: socket.socket) -> NetworkManager:
+    manager = NetworkManager(GameModes.ONLINE, None, None)
+    manager._conn = conn
+    manager._network_role = role
+    return manager
+
+
+def test_new_peers_switch_to_framed_protocol():
+    host_side, client_side = socket.socketpair()
+    host, client = _manager("host", host_side), _manager("client", client_side)
+    host.poll()
+    client.poll()
+    assert host.get_stats().pings_sent == client.get_stats().pings_sent == 0
+
+    host.send_move("3,4", (1, 2, 3))
+    assert client.receive_move() == Point(3, 4)
+    client.send_move("5,6", (7, 8, 9))
+    assert host.receive_move() == Point(5, 6)
+    assert host.last_move_clock == (7, 8, 9)
+
+
+def test_old_client_gets_only_bare_moves():
+    host_side, old_client = socket.socketpair()
+    host = _manager("host", host_side)
+    for _ in range(3):
+        host.poll()
+    host.send_move("3,4", (1, 2, 3))
+    # Старая версия делает data.decode().strip().split(',')
+    assert old_client.recv(100).decode().strip().split(",") == ["3", "4"]
+
+    old_client.sendall(b"5,6")
+    host.poll()
+    time.sleep(LEGACY_MESSAGE_TIMEOUT + 0.05)
+    assert host.receive_move() == Point(5, 6)
+    host.send_move("1,1", (1, 1, 1))
+    assert old_client.recv(100) == b"1,1"
+    assert host.get_stats().pings_sent == 0
+
+
+def test_lost_connection_is_reported_not_fatal():
+    host_side, client_side = socket.socketpair()
+    host = _manager("host", host_side)
+    host._peer_framed = True
+    client_side.close()
+    host.poll()
+    host.poll()
+    host.send_move("2,2")
+    stats = host.get_stats()
+    assert not stats.connected and stats.stalled
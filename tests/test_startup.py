@@ -0,0 +1,12 @@
+import startup
+from settings import STARTUP_BUDGET_MS
+
+
+def test_first_menu_frame_within_budget(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    in_process_ms, wall_ms = startup.measure_first_frame()
+    assert 0 < in_process_ms <= wall_ms
+    # Бюджет проверяется по медиане нескольких запусков: одиночный замер шумит
+    assert startup.check_startup_budget(STARTUP_BUDGET_MS), \
+        f"первый кадр меню дольше {STARTUP_BUDGET_MS:.0f} мс (последний замер {wall_ms:.1f} мс)"
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+
+from ai import ComputerPlayer
+from patterns import PatternWeights
+from point import Point
+from tactics import TacticalReader
+from transposition import TranspositionTable
+
+
+def _player(size: int) -> ComputerPlayer:
+    return ComputerPlayer(size, transpositions=TranspositionTable(), use_book=False,
+                          rng=random.Random(0), weights=PatternWeights())
+
+
+def _scores(board: np.ndarray, color_code: int) -> dict[tuple[int, int], float]:
+    return {move: score for score, move in _player(board.shape[0]).score_moves(board, color_code)}
+
+
+def _ladder_board() -> np.ndarray:
+    # Белый камень с двумя дыханиями, ход чёрных: атари гонит его по диагонали к краю
+    board = np.zeros((9, 9))
+    board[4, 4] = 1
+    board[3, 4] = board[4, 3] = board[5, 5] = 2
+    return board
+
+
+def test_ladder_works():
+    board = _ladder_board()
+    assert TacticalReader(9).ladder_works(board, Point(4, 4))
+    board[4, 5] = 2  # атари: убежать нельзя
+    assert not TacticalReader(9).can_escape(board, Point(4, 4))
+    assert TacticalReader(9).ladder_works(board, Point(4, 4))
+
+
+def test_ladder_breaker():
+    board = _ladder_board()
+    board[4, 5] = 2
+    board[6, 2] = 1  # белый камень на пути лестницы
+    assert TacticalReader(9).can_escape(board, Point(4, 4))
+    assert not TacticalReader(9).ladder_works(board, Point(4, 4))
+
+    # Без атари чёрные выбирают направление, поэтому ломать нужно оба
+    board = _ladder_board()
+    board[6, 2] = board[2, 6] = 1
+    assert not TacticalReader(9).ladder_works(board, Point(4, 4))
+
+
+def test_best_move_captures_in_ladder():
+    board = _ladder_board()
+    board[5, 4] = 2
+    assert _player(9).best_move(board, 2) == (4, 5)
+
+
+def test_suicide_is_ranked_last():
+    board = np.zeros((5, 5))
+    board[0, 1] = board[1, 0] = 1
+    scored = _player(5).score_moves(board, 2)
+    assert scored[-1][1] == (0, 0)
+
+
+def test_capture_without_liberties_is_not_suicide():
+    board = np.zeros((5, 5))
+    # Белые камни у угла в атари: чёрный ход в их общее последнее дыхание снимает их
+    board[0, 1] = board[1, 0] = 1
+    board[0, 2] = board[1, 1] = board[2, 0] = 2
+    assert _scores(board, 2)[(0, 0)] > 0
+
+
+def test_self_atari_is_penalised():
+    board = np.zeros((5, 5))
+    board[0, 1] = board[2, 0] = 1
+    assert _scores(board, 2)[(1, 0)] < 0
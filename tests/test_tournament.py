@@ -0,0 +1,31 @@
+import tournament
+from tournament import GameTask, configuration_results, play_game
+
+
+def _result(**overrides) -> dict:
+    result = {"size": 9, "tournament_seed": 0, "komi": 6.5, "max_moves": 162, "margin": 40,
+              "black": "random", "white": "heuristic"}
+    result.update(overrides)
+    return result
+
+
+def test_results_of_other_configurations_are_excluded():
+    results = [_result(), _result(komi=0.5), _result(tournament_seed=1), _result(max_moves=50),
+               _result(margin=10), _result(size=19), _result(white="nobook")]
+    selected = configuration_results(results, ["random", "heuristic"], 9, 0, 6.5, 162, 40)
+    assert selected == [results[0]]
+
+
+def test_suicide_counts_as_pass(monkeypatch):
+    # Белые окружают угол и пасуют, чёрные снова и снова ходят в него самоубийством
+    def make_engine(spec, size, rng):
+        if spec == "black":
+            return lambda board, color_code: (0, 0) if board[0, 1] == board[1, 0] == 1 else None
+        return lambda board, color_code: next(((col, row) for col, row in ((0, 1), (1, 0)) if board[col, row] == 0),
+                                              None)
+
+    monkeypatch.setattr(tournament, "make_engine", make_engine)
+    task = GameTask("test", 5, "black", "white", 0, 0.5, 50, 100, 0)
+    result = play_game(task)
+    assert result["reason"] == "passes"
+    assert result["moves"] < 50
@@ -0,0 +1,24 @@
+import numpy as np
+
+from transposition import TranspositionTable
+from zobrist import position_hash, update_hash
+
+
+def test_empty_boards_of_different_sizes_differ():
+    small = position_hash(np.zeros((9, 9)), black_to_move=True)
+    large = position_hash(np.zeros((19, 19)), black_to_move=True)
+    assert small != large
+
+
+def test_transposition_table_misses_across_sizes():
+    table = TranspositionTable()
+    table.store(position_hash(np.zeros((9, 9)), black_to_move=False), 1.0, (4, 4))
+    assert table.get(position_hash(np.zeros((19, 19)), black_to_move=False)) is None
+
+
+def test_update_hash_matches_full_hash():
+    board = np.zeros((9, 9))
+    value = position_hash(board, black_to_move=False)
+    board[2, 3] = 2
+    value = update_hash(value, 9, 2, 3, 0, 2)
+    assert value == position_hash(board, black_to_move=False)
@@ -0,0 +1,276 @@
+import argparse
+import concurrent.futures
+import itertools
+import json
+import math
+import os
+import random
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+import numpy as np
+
+from gtp import area_score
+from main_logic import game_logic
+from settings import *
+
+Engine = Callable[[np.ndarray, int], tuple[int, int] | None]
+ENGINE_KINDS = ("random", "heuristic", "nobook")
+
+
+@dataclass(frozen=True)
+class GameTask:
+    game_id: str
+    size: int
+    black: str
+    white: str
+    seed: int
+    komi: float
+    max_moves: int
+    margin: float
+    tournament_seed: int  # зерно всего турнира; seed партии выводится из него
+
+
+def make_engine(spec: str, size: int, rng: random.Random) -> Engine:
+    """
+    Движок по описанию "вид[@секунды]": random — случайные ходы, heuristic — ComputerPlayer
+    с дебютной книгой, nobook — без неё; @секунды — бюджет времени на ход.
+    """
+    kind, _, budget = spec.partition("@")
+    if kind not in ENGINE_KINDS:
+        raise ValueError(f"неизвестный движок: {spec}")
+    from ai import ComputerPlayer
+    from transposition import TranspositionTable
+
+    # Своя таблица транспозиций на партию: партии в одном процессе не влияют друг на друга
+    player = ComputerPlayer(size, transpositions=TranspositionTable(), use_book=kind != "nobook", rng=rng)
+    if kind == "random":
+        return lambda board, color_code: player.random_move(board)
+    time_budget = float(budget) if budget else None
+    return lambda board, color_code: player.best_move(board, color_code, time_budget)
+
+
+def play_game(task: GameTask) -> dict:
+    """
+    Одна партия без интерфейса по правилам game_logic. Первыми ходят чёрные. Партия прекращается
+    после двух пасов подряд, по лимиту ходов или когда перевес по площади превышает margin.
+    """
+    rng = random.Random(task.seed)
+    engines = {2: make_engine(task.black, task.size, rng), 1: make_engine(task.white, task.size, rng)}
+    thinking = {2: 0.0, 1: 0.0}
+    logic = game_logic(task.size)
+    board = np.zeros((task.size, task.size))
+    color_code = 2
+    passes = 0
+    moves = 0
+    reason = "max_moves"
+    # Перевес проверяем, только когда доска заполнена хотя бы на треть: раньше подсчёт по площади ничего не значит
+    adjudicate_from = task.size * task.size // 3
+    while moves < task.max_moves:
+        started = time.perf_counter()
+        move = engines[color_code](board, color_code)
+        thinking[color_code] += time.perf_counter() - started
+        moves += 1
+        played = move is not None and logic.is_valid_move(*move, board)
+        if played:
+            board[move] = color_code
+            logic.resolve_captures(board, *move)
+            played = board[move] != 0  # при самоубийстве resolve_captures снимает камень
+        # Недопустимый ход или самоубийство считается пасом
+        if not played:
+            passes += 1
+            if passes == 2:
+                reason = "passes"
+                break
+        else:
+            passes = 0
+        color_code = 3 - color_code
+        if moves >= adjudicate_from and moves % ADJUDICATE_EVERY == 0 \
+                and abs(area_score(board, task.komi)) >= task.margin:
+            reason = "margin"
+            break
+
+    score = area_score(board, task.komi)
+    winner = task.black if score > 0 else task.white if score < 0 else None
+    return {**asdict(task), "winner": winner, "score": score, "moves": moves, "reason": reason,
+            "time_black_s": round(thinking[2], 3), "time_white_s": round(thinking[1], 3)}
+
+
+def pairings(engines: list[str], games_per_pair: int, gauntlet: bool) -> list[tuple[str, str, int]]:
+    """
+    Пары (чёрные, белые, номер партии в паре). Круговой турнир — все со всеми, гаунтлет — первый
+    движок против остальных. Цвета чередуются от партии к партии.
+    """
+    pairs = [(engines[0], other) for other in engines[1:]] if gauntlet else list(itertools.combinations(engines, 2))
+    schedule = []
+    for index in range(games_per_pair):
+        for first, second in pairs:
+            schedule.append((first, second, index) if index % 2 == 0 else (second, first, index))
+    return schedule
+
+
+def load_results(path: str) -> list[dict]:
+    results = []
+    try:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # строка, недописанная при прерывании
+    except FileNotFoundError:
+        pass
+    return results
+
+
+def elo_ratings(results: list[dict]) -> dict[str, tuple[float, float, int, float]]:
+    """
+    Рейтинги Эло по модели Брэдли — Терри (максимум правдоподобия, ничья — пол-победы) с 95% интервалом
+    по информации Фишера. Каждой паре добавляется одна виртуальная ничья, чтобы рейтинг движка без
+    поражений оставался конечным. Средний рейтинг — 0.
+    Возвращает движок -> (Эло, ± интервал, партий, доля очков).
+    """
+    players = sorted({result["black"] for result in results} | {result["white"] for result in results})
+    wins = {player: {other: 0.0 for other in players} for player in players}
+    games = {player: {other: 0.0 for other in players} for player in players}
+    for result in results:
+        black, white = result["black"], result["white"]
+        black_points = 1.0 if result["winner"] == black else 0.0 if result["winner"] == white else 0.5
+        wins[black][white] += black_points
+        wins[white][black] += 1 - black_points
+        games[black][white] += 1
+        games[white][black] += 1
+    for player, other in itertools.permutations(players, 2):
+        if games[player][other]:
+            wins[player][other] += 0.5
+            games[player][other] += 1
+
+    # Итерации миноризации-максимизации (Hunter, 2004) для сил gamma = 10^(Эло/400)
+    gamma = {player: 1.0 for player in players}
+    for _ in range(1000):
+        updated = {}
+        for player in players:
+            total_wins = sum(wins[player].values())
+            denominator = sum(games[player][other] / (gamma[player] + gamma[other])
+                              for other in players if games[player][other])
+            updated[player] = total_wins / denominator if denominator else 1.0
+        scale = math.exp(sum(math.log(value) for value in updated.values()) / len(updated))
+        updated = {player: value / scale for player, value in updated.items()}
+        converged = max(abs(math.log(updated[player] / gamma[player])) for player in players) < 1e-9
+        gamma = updated
+        if converged:
+            break
+
+    elo_per_nat = 400 / math.log(10)
+    ratings = {}
+    for player in players:
+        information = sum(games[player][other] * gamma[player] * gamma[other] / (gamma[player] + gamma[other]) ** 2
+                          for other in players if games[player][other])
+        interval = 1.96 * elo_per_nat / math.sqrt(information) if information else float("inf")
+        played = [result for result in results if player in (result["black"], result["white"])]
+        points = sum(1.0 if result["winner"] == player else 0.5 if result["winner"] is None else 0.0
+                     for result in played)
+        ratings[player] = (elo_per_nat * math.log(gamma[player]), interval, len(played),
+                           points / len(played) if played else 0.0)
+    return ratings
+
+
+def configuration_results(results: list[dict], engines: list[str], size: int, seed: int, komi: float,
+                          max_moves: int, margin: float) -> list[dict]:
+    """
+    Результаты одного турнира: те же параметры партий и только партии между движками engines.
+    В одном файле могут лежать турниры с разными настройками, смешивать их в одном рейтинге нельзя.
+    """
+    lineup = set(engines)
+    return [result for result in results
+            if (result["size"], result.get("tournament_seed"), result["komi"], result["max_moves"], result["margin"])
+            == (size, seed, komi, max_moves, margin)
+            and result["black"] in lineup and result["white"] in lineup]
+
+
+def print_table(results: list[dict]) -> None:
+    if not results:
+        print("Результатов пока нет")
+        return
+    print(f"{'движок':20s} {'Эло':>8s} {'±95%':>7s} {'партий':>7s} {'очки':>6s} {'с/ход':>7s}")
+    thinking: dict[str, list[float]] = {}
+    for result in results:
+        black_moves = (result["moves"] + 1) // 2
+        thinking.setdefault(result["black"], []).append(result["time_black_s"] / max(black_moves, 1))
+        thinking.setdefault(result["white"], []).append(result["time_white_s"] / max(result["moves"] - black_moves, 1))
+    ratings = elo_ratings(results)
+    for player, (elo, interval, played, score) in sorted(ratings.items(), key=lambda item: -item[1][0]):
+        per_move = sum(thinking[player]) / len(thinking[player])
+        print(f"{player:20s} {elo:8.0f} {interval:7.0f} {played:7d} {score:6.1%} {per_move:7.3f}")
+    reasons: dict[str, int] = {}
+    for result in results:
+        reasons[result["reason"]] = reasons.get(result["reason"], 0) + 1
+    print("Окончание партий: " + ", ".join(f"{reason} {count}" for reason, count in sorted(reasons.items())))
+
+
+def run(engines: list[str], size: int, games_per_pair: int, gauntlet: bool, results_path: str, workers: int,
+        seed: int, komi: float, max_moves: int, margin: float) -> None:
+    """
+    Запускает недостающие партии в пуле процессов. Каждый результат сразу дописывается в results_path,
+    поэтому прерванный турнир продолжается повторным запуском с теми же параметрами. Параметры партии
+    входят в game_id: запуск с другим зерном, коми или лимитами играет свои партии, а не берёт чужие.
+    """
+    for spec in engines:
+        make_engine(spec, size, random.Random())  # ошибки в описании движков — до запуска пула
+    done = {result["game_id"] for result in load_results(results_path)}
+    tasks = []
+    skipped = 0
+    for black, white, index in pairings(engines, games_per_pair, gauntlet):
+        game_id = f"{size}:{black}:{white}:{index}:seed={seed}:komi={komi:g}:moves={max_moves}:margin={margin:g}"
+        if game_id in done:
+            skipped += 1
+            continue
+        game_seed = zlib.crc32(f"{seed}:{game_id}".encode())
+        tasks.append(GameTask(game_id, size, black, white, game_seed, komi, max_moves, margin, seed))
+    print(f"Партий: {len(tasks)} (уже сыграно {skipped}), процессов: {workers}")
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(results_path, "a", encoding="utf-8") as file:
+        futures = [pool.submit(play_game, task) for task in tasks]
+        try:
+            for number, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                result = future.result()
+                file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                file.flush()
+                winner = result["winner"] or "ничья"
+                print(f"[{number}/{len(tasks)}] {result['black']} — {result['white']}: {winner} "
+                      f"({result['score']:+g}, {result['moves']} ходов, {result['reason']})")
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            print("Прервано: сыгранные партии сохранены")
+    print_table(configuration_results(load_results(results_path), engines, size, seed, komi, max_moves, margin))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Турнир движков без интерфейса")
+    parser.add_argument("engines", nargs="*", default=["random", "heuristic", "heuristic@0.05"],
+                        help="движки: random, heuristic, nobook, с необязательным бюджетом @секунды")
+    parser.add_argument("--size", type=int, default=9)
+    parser.add_argument("--games", type=int, default=10, help="партий на каждую пару")
+    parser.add_argument("--gauntlet", action="store_true", help="первый движок против всех остальных")
+    parser.add_argument("--results", default=TOURNAMENT_RESULTS_PATH, help="файл результатов (JSON Lines)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--komi", type=float, default=KOMI)
+    parser.add_argument("--max-moves", type=int, help="лимит ходов (по умолчанию 2 * size * size)")
+    parser.add_argument("--margin", type=float, default=TOURNAMENT_MARGIN,
+                        help="перевес по площади, при котором партия присуждается")
+    parser.add_argument("--table", action="store_true",
+                        help="только показать таблицу по файлу результатов (для тех же движков и параметров)")
+    args = parser.parse_args()
+
+    max_moves = args.max_moves or 2 * args.size * args.size
+    if args.table:
+        print_table(configuration_results(load_results(args.results), args.engines, args.size, args.seed, args.komi,
+                                          max_moves, args.margin))
+    else:
+        run(args.engines, args.size, args.games, args.gauntlet, args.results, args.workers, args.seed, args.komi,
+            max_moves, args.margin)
@@ -0,0 +1,103 @@
+import collections
+from dataclasses import dataclass
+
+from settings import *
+
+
+@dataclass(slots=True)
+class TTEntry:
+    visits: int
+    value: float
+    best_move: tuple[int, int] | None
+
+
+@dataclass(frozen=True)
+class TTStats:
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    entries: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def occupancy(self) -> float:
+        return self.entries / self.capacity
+
+    def __str__(self) -> str:
+        return (f"попаданий {self.hit_rate:.1%} ({self.hits}/{self.hits + self.misses}), "
+                f"заполнено {self.occupancy:.1%} ({self.entries}/{self.capacity}), вытеснено {self.evictions}")
+
+
+class TranspositionTable:
+    """
+    Таблица транспозиций: хэш позиции -> число посещений, оценка и лучший ход.
+    Размер ограничен по памяти, при переполнении вытесняется давно не использованная запись (LRU).
+    """
+
+    # Оценка памяти на запись: ключ, TTEntry, кортеж хода и узел OrderedDict
+    ENTRY_BYTES = 256
+
+    def __init__(self, max_bytes: int = TT_MAX_BYTES) -> None:
+        self._capacity = max(1, max_bytes // self.ENTRY_BYTES)
+        self._entries: collections.OrderedDict[int, TTEntry] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: int) -> TTEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: int, value: float, best_move: tuple[int, int] | None, visits: int = 1) -> TTEntry:
+        """
+        Добавляет результат поиска; для известной позиции оценка усредняется с учётом числа посещений.
+        """
+        self._stores += 1
+        entry = self._entries.get(key)
+        if entry is not None:
+            total = entry.visits + visits
+            entry.value += (value - entry.value) * visits / total
+            entry.visits = total
+            if best_move is not None:
+                entry.best_move = best_move
+            self._entries.move_to_end(key)
+            return entry
+
+        entry = TTEntry(visits, value, best_move)
+        self._entries[key] = entry
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> TTStats:
+        return TTStats(self._hits, self._misses, self._stores, self._evictions, len(self._entries), self._capacity)
+
+
+_shared_table: TranspositionTable | None = None
+
+
+def get_shared_table() -> TranspositionTable:
+    """Общая на процесс таблица: позиции повторяются и между партиями."""
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = TranspositionTable()
+    return _shared_table
@@ -0,0 +1,40 @@
+import functools
+
+import numpy as np
+
+_SIDE_TO_MOVE_KEY = 0x9E3779B97F4A7C15
+
+
+@functools.cache
+def _keys(size: int) -> np.ndarray:
+    # Ключи детерминированы: хэши позиций можно сохранять в файлы (дебютная книга и т.п.)
+    rng = np.random.default_rng(0x2B0B + size)
+    keys = rng.integers(0, np.iinfo(np.uint64).max, size=(3, size, size), dtype=np.uint64, endpoint=True)
+    keys[0] = 0  # пустые клетки не влияют на хэш
+    return keys
+
+
+@functools.cache
+def _size_key(size: int) -> int:
+    # Без ключа размера пустые (и совпадающие по камням) позиции разных досок давали бы одинаковый хэш
+    return int(np.random.default_rng(0x5123 + size).integers(1, np.iinfo(np.uint64).max, dtype=np.uint64,
+                                                             endpoint=True))
+
+
+def position_hash(board: np.ndarray, black_to_move: bool) -> int:
+    """
+    64-битный хэш Зобриста позиции с учётом размера доски и очереди хода.
+    """
+    size = board.shape[0]
+    keys = _keys(size)
+    codes = board.astype(np.intp, copy=False)
+    cols, rows = np.nonzero(codes)
+    value = int(np.bitwise_xor.reduce(keys[codes[cols, rows], cols, rows])) if len(cols) else 0
+    value ^= _size_key(size)
+    return value ^ _SIDE_TO_MOVE_KEY if black_to_move else value
+
+
+def update_hash(value: int, size: int, col: int, row: int, old: int, new: int) -> int:
+    """Инкрементальное обновление хэша при смене содержимого одной клетки."""
+    keys = _keys(size)
+    return value ^ int(keys[old, col, row]) ^ int(keys[new, col, row])